@@ -7,9 +7,12 @@ Handles admin permissions and command authorization
 import os
 import yaml
 import logging
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, List, Optional, Set, Tuple
 from pathlib import Path
 
+# Upper bound on memoized (user, command) permission results
+PERMISSION_CACHE_SIZE = 1024
+
 
 class AdminManager:
     """Manages admin permissions and command authorization"""
@@ -28,6 +31,8 @@ class AdminManager:
         self.admins: Set[str] = set()
         self.admin_commands: Dict[str, List[str]] = {}
         self.public_commands: List[str] = []
+        # (user, command) -> allowed, cleared whenever admins or permissions change
+        self._permission_cache: Dict[Tuple[str, str], bool] = {}
         
         # Load configuration
         self._load_config()
@@ -56,6 +61,8 @@ class AdminManager:
     
     def _parse_config(self):
         """Parse loaded configuration into internal structures"""
+        self._permission_cache.clear()
+        
         # Get admins list
         admins_config = self.config.get('admins', [])
         
@@ -129,6 +136,16 @@ class AdminManager:
     
     def can_run_command(self, user_identifier: str, command: str) -> bool:
         """Check if user can run a specific command by Contact ID"""
+        key = (user_identifier, command)
+        allowed = self._permission_cache.get(key)
+        if allowed is None:
+            if len(self._permission_cache) >= PERMISSION_CACHE_SIZE:
+                self._permission_cache.clear()
+            allowed = self._permission_cache[key] = self._check_command_permission(user_identifier, command)
+        return allowed
+    
+    def _check_command_permission(self, user_identifier: str, command: str) -> bool:
+        """Evaluate command permission against the loaded configuration"""
         # Check if admin-only mode is enabled
         if self.config.get('settings', {}).get('admin_only_mode', False):
             return self.is_admin(user_identifier)
@@ -172,6 +189,7 @@ class AdminManager:
         try:
             self.admins.add(user_name)
             self.admin_commands[user_name] = commands
+            self._permission_cache.clear()
             
             # Update config file
             if 'admins' not in self.config:
@@ -201,6 +219,7 @@ class AdminManager:
         try:
             self.admins.remove(user_name)
             self.admin_commands.pop(user_name, None)
+            self._permission_cache.clear()
             
             # Update config file
             if 'admins' in self.config and user_name in self.config['admins']:
@@ -7,10 +7,11 @@ Main orchestrator using dependency injection
 import asyncio
 import argparse
 import logging
+import re
 import signal
 import sys
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import IO, Dict, Any, Optional
 
 # Import configuration manager
 from config_manager import ConfigManager
@@ -40,6 +41,12 @@ BYTES_PER_MB = 1024 * 1024
 BYTES_PER_GB = 1024 * 1024 * 1024
 BYTES_PER_KB = 1024
 
+# Command prefix and command name, optional whitespace around the prefix
+COMMAND_PATTERN = re.compile(r'\s*!\s*(\S+)')
+
+# Response for commands neither a plugin nor the legacy registry handles
+_format_unknown = "Unknown command: {name}".format
+
 
 # Exception hierarchy
 class SimplexBotError(Exception):
@@ -127,11 +134,14 @@ class DailyRotatingLogger:
 class CommandRegistry:
     """Registry for bot commands with extensible architecture"""
     
+    __slots__ = ('logger', 'admin_manager', 'bot_instance', 'commands', '_command_names')
+    
     def __init__(self, logger: logging.Logger, admin_manager: AdminManager, bot_instance=None):
         self.logger = logger
         self.admin_manager = admin_manager
         self.bot_instance = bot_instance
         self.commands = {}
+        self._command_names: Optional[frozenset] = None
         self._register_default_commands()
     
     def _register_default_commands(self):
@@ -147,6 +157,7 @@ class CommandRegistry:
     def register_command(self, name: str, handler):
         """Register a new command"""
         self.commands[name] = handler
+        self._command_names = None
         self.logger.info(f"Registered command: {name}")
     
     def get_command(self, name: str):
@@ -157,31 +168,33 @@ class CommandRegistry:
         """List all available commands"""
         return list(self.commands.keys())
     
+    def command_names(self) -> frozenset:
+        """Set of registered command names, cached until the next registration"""
+        if self._command_names is None:
+            self._command_names = frozenset(self.commands)
+        return self._command_names
+    
     def is_command(self, text: str) -> bool:
         """Check if text is a command"""
-        if not text.strip():
+        # Any !name is accepted here - plugin commands are resolved in execute_command
+        if not text:
             return False
-        
-        # Check if starts with command prefix (default: !)
-        text = text.strip()
-        if text.startswith('!'):
-            command_part = text[1:].split()[0] if text[1:].split() else ""
-            # Check both legacy commands and assume plugin commands exist
-            # Plugin commands will be handled in execute_command
-            return command_part in self.commands or len(command_part) > 0
-        
+        first = text[0]
+        if first == '!' and len(text) > 1 and not text[1].isspace():
+            return True  # Common case, "!name..." needs no further scanning
+        if first == '!' or first.isspace():
+            return COMMAND_PATTERN.match(text) is not None
         return False
     
     async def execute_command(self, text: str, contact_name: str, plugin_manager=None, message_data: Dict[str, Any] = None) -> Optional[str]:
         """Execute a command and return the response"""
-        if not self.is_command(text):
+        match = COMMAND_PATTERN.match(text) if text else None
+        if match is None:
             return None
         
         # Parse command and arguments
-        command_text = text[1:]  # Remove ! prefix
-        parts = command_text.split()
-        command_name = parts[0] if parts else ""
-        args = parts[1:] if len(parts) > 1 else []
+        command_name = match.group(1)
+        args = text[match.end():].split()
         
         # Use contact_name for admin checks (simple and reliable)
         user_identifier = contact_name
@@ -240,9 +253,9 @@ class CommandRegistry:
                 # Fall through to legacy commands
         
         # Fall back to legacy command registry
-        handler = self.get_command(command_name)
-        if not handler:
-            return f"Unknown command: {command_name}"
+        handler = self.commands.get(command_name)
+        if handler is None:
+            return _format_unknown(name=command_name)
         
         try:
             # For backward compatibility, we'll capture the send_message_callback
@@ -262,6 +275,10 @@ class CommandRegistry:
     
     async def _help_command(self, args: list, contact_name: str, send_message_callback):
         """Comprehensive help command that includes bot info and all available commands"""
+        await send_message_callback(contact_name, self._render_help())
+    
+    def _render_help(self) -> str:
+        """Build the help text from version.yml, loaded plugins and registered commands"""
         import yaml
         from pathlib import Path
         from datetime import datetime
@@ -302,7 +319,7 @@ class CommandRegistry:
                         total_commands += len(commands)
         
         # Add legacy commands from command registry
-        legacy_commands = self.list_commands()
+        legacy_commands = self.command_names()
         if legacy_commands:
             total_commands += len(legacy_commands)
         
@@ -407,13 +424,15 @@ class CommandRegistry:
         for tip in tips:
             help_text += f"\n• {tip}"
         
-        await send_message_callback(contact_name, help_text)
+        return help_text
 
 
 class SimplexChatBot:
     """Main bot orchestrator using dependency injection"""
     
-    def __init__(self, config_path: str = "config.yml", cli_args: Optional[argparse.Namespace] = None):
+    def __init__(self, config_path: str = "config.yml", cli_args: Optional[argparse.Namespace] = None,
+                 config_manager: Optional[ConfigManager] = None,
+                 logger_manager: Optional[DailyRotatingLogger] = None):
         # Record startup time to ignore old messages
         import time
         self.startup_timestamp = time.time()
@@ -422,11 +441,11 @@ class SimplexChatBot:
         
         # Load configuration
         self.cli_args = cli_args
-        self.config_manager = ConfigManager(config_path)
+        self.config_manager = config_manager or ConfigManager(config_path)
         self.config = self.config_manager.get_bot_config()
         
-        # Setup logging
-        self.logger_manager = DailyRotatingLogger(
+        # Setup logging, reusing a pre-built logger manager if one was given
+        self.logger_manager = logger_manager or DailyRotatingLogger(
             "SimplexChatBot", 
             "SimplexChatMessages", 
             self.config.get('logging', {})
@@ -462,6 +481,20 @@ class SimplexChatBot:
         
         self.logger.info("SimplexChatBot initialized with clean architecture")
     
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any], cli_args: Optional[argparse.Namespace] = None,
+                  logger_manager: Optional[DailyRotatingLogger] = None) -> 'SimplexChatBot':
+        """Create bot from an already-parsed configuration dictionary, skipping YAML loading"""
+        return cls(cli_args=cli_args, config_manager=ConfigManager.from_dict(config),
+                   logger_manager=logger_manager)
+    
+    @classmethod
+    def from_stream(cls, stream: IO, cli_args: Optional[argparse.Namespace] = None,
+                    logger_manager: Optional[DailyRotatingLogger] = None) -> 'SimplexChatBot':
+        """Create bot from a YAML stream (e.g. StringIO) instead of a config file on disk"""
+        return cls(cli_args=cli_args, config_manager=ConfigManager.from_stream(stream),
+                   logger_manager=logger_manager)
+    
     def _initialize_components(self):
         """Initialize all components with proper dependency injection"""
         # Initialize XFTP client
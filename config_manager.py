@@ -4,40 +4,129 @@ Configuration Manager for SimpleX Chat Bot
 Handles YAML configuration loading with environment variable substitution
 """
 
+import functools
 import os
 import yaml
 import logging
-from typing import Dict, Any, Optional
+from typing import IO, Dict, Any, Optional
 from dotenv import load_dotenv
 import re
+import sys
 
 logger = logging.getLogger(__name__)
 
 # Constants
 DEFAULT_RETENTION_DAYS = 30
 BYTES_PER_KB = 1024
+REQUIRED_SECTIONS = ('servers', 'bot', 'logging', 'media', 'commands', 'security')
+
+# libyaml's C scanner when PyYAML was built with it, pure-Python otherwise
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Size strings such as '100MB', '1.5k' or '2048' - number, optional unit, optional trailing B
+FILE_SIZE_PATTERN = re.compile(r'\s*([\d.]+)\s*([KMGT]?)B?\s*$', re.IGNORECASE)
+FILE_SIZE_MULTIPLIERS = {
+    'K': BYTES_PER_KB,
+    'M': BYTES_PER_KB ** 2,
+    'G': BYTES_PER_KB ** 3,
+    'T': BYTES_PER_KB ** 4
+}
+
+# Matches ${VAR_NAME} or ${VAR_NAME:-default}
+ENV_VAR_PATTERN = re.compile(r'\$\{([^}]+)\}')
+
+
+def _replace_env_var(match: re.Match) -> str:
+    """Resolve a single ${VAR_NAME} / ${VAR_NAME:-default} placeholder match"""
+    var_expr = match.group(1)
+    
+    # Check if there's a default value
+    if ':-' in var_expr:
+        var_name, default_value = var_expr.split(':-', 1)
+        var_name = var_name.strip()
+        
+        # Handle malformed syntax - empty variable name
+        if not var_name:
+            return match.group(0)  # Return original malformed syntax
+        
+        env_value = os.getenv(var_name)
+        # Use default if variable is None or empty string
+        if env_value is None or env_value == '':
+            return default_value
+        return env_value
+    else:
+        var_name = var_expr.strip()
+        
+        # Handle malformed syntax - empty variable name
+        if not var_name:
+            return match.group(0)  # Return original malformed syntax
+        
+        env_value = os.getenv(var_name)
+        if env_value is None:
+            logger.warning(f"Environment variable {var_name} not found")
+            return match.group(0)  # Return original if not found
+        return env_value
+
+
+def _intern_strings(value: Any) -> Any:
+    """Return a copy of parsed YAML with every string key and value interned"""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return {
+            sys.intern(k) if isinstance(k, str) else k: _intern_strings(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_intern_strings(item) for item in value]
+    return value
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_yaml_cached(content: bytes) -> Any:
+    """
+    Parse YAML file content, memoized on the bytes themselves so identical files are only parsed once
+    regardless of path. Callers must not mutate the result - _substitute_env_vars builds fresh containers.
+    """
+    # Interned once per distinct file, so keys compare by identity in every lookup after
+    return _intern_strings(yaml.load(content, Loader=_YAML_LOADER))
 
 
 class ConfigManager:
     """Manages bot configuration from YAML files with environment variable substitution"""
     
-    def __init__(self, config_path: str = "config.yml", env_file: str = ".env"):
+    def __init__(self, config_path: Optional[str] = "config.yml", env_file: str = ".env",
+                 base_dir: Optional[str] = None, raw_config: Optional[Dict[str, Any]] = None):
         """
         Initialize configuration manager
         
         Args:
-            config_path: Path to YAML configuration file
+            config_path: Path to YAML configuration file, or None when raw_config is given
             env_file: Path to environment file
+            base_dir: Directory relative config_path and env_file are resolved against, instead of
+                the working directory
+            raw_config: Already-parsed configuration to use instead of reading config_path,
+                may contain ${VAR} placeholders
         """
-        self.config_path = config_path
-        self.env_file = env_file
+        self.base_dir = base_dir
+        self.config_path = self._resolve_path(config_path) if config_path is not None else None
+        self.env_file = self._resolve_path(env_file)
         self.config: Dict[str, Any] = {}
         
         # Load environment variables first
         self._load_env_file()
         
         # Load and parse configuration
-        self._load_config()
+        if raw_config is not None:
+            self._apply_config(raw_config)
+        else:
+            self._load_config()
+    
+    def _resolve_path(self, path: str) -> str:
+        """Resolve a relative path against base_dir when one was given"""
+        if self.base_dir and not os.path.isabs(path):
+            return os.path.join(self.base_dir, path)
+        return path
     
     def _load_env_file(self):
         """Load environment variables from .env file"""
@@ -49,53 +138,43 @@ class ConfigManager:
     
     def _substitute_env_vars(self, value: Any) -> Any:
         """
-        Recursively substitute environment variables in configuration values
-        Supports ${VAR_NAME} and ${VAR_NAME:-default_value} syntax
+        Substitute environment variables in configuration values, walking nested
+        dicts and lists with an explicit stack instead of recursion.
+        Supports ${VAR_NAME} and ${VAR_NAME:-default_value} syntax.
+        Containers are shallow-copied level by level so the input is never mutated.
         """
         if isinstance(value, str):
-            # Pattern to match ${VAR_NAME} or ${VAR_NAME:-default}
-            pattern = r'\$\{([^}]+)\}'
-            
-            def replace_var(match):
-                var_expr = match.group(1)
-                
-                # Check if there's a default value
-                if ':-' in var_expr:
-                    var_name, default_value = var_expr.split(':-', 1)
-                    var_name = var_name.strip()
-                    
-                    # Handle malformed syntax - empty variable name
-                    if not var_name:
-                        return match.group(0)  # Return original malformed syntax
-                    
-                    env_value = os.getenv(var_name)
-                    # Use default if variable is None or empty string
-                    if env_value is None or env_value == '':
-                        return default_value
-                    return env_value
-                else:
-                    var_name = var_expr.strip()
-                    
-                    # Handle malformed syntax - empty variable name
-                    if not var_name:
-                        return match.group(0)  # Return original malformed syntax
-                    
-                    env_value = os.getenv(var_name)
-                    if env_value is None:
-                        logger.warning(f"Environment variable {var_name} not found")
-                        return match.group(0)  # Return original if not found
-                    return env_value
-            
-            return re.sub(pattern, replace_var, value)
+            # Most values carry no placeholder - skip the regex scan entirely
+            if '${' not in value:
+                return value
+            return ENV_VAR_PATTERN.sub(_replace_env_var, value)
         
-        elif isinstance(value, dict):
-            return {k: self._substitute_env_vars(v) for k, v in value.items()}
+        if not isinstance(value, (dict, list)):
+            return value
         
-        elif isinstance(value, list):
-            return [self._substitute_env_vars(item) for item in value]
+        # Each distinct placeholder is resolved once per pass, however often it repeats
+        resolved: Dict[str, str] = {}
         
-        else:
-            return value
+        def replace(match: re.Match) -> str:
+            placeholder = match.group(0)
+            if placeholder not in resolved:
+                resolved[placeholder] = _replace_env_var(match)
+            return resolved[placeholder]
+        
+        root = value.copy()
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            items = node.items() if isinstance(node, dict) else enumerate(node)
+            for key, item in items:
+                if isinstance(item, str):
+                    if '${' in item:
+                        node[key] = ENV_VAR_PATTERN.sub(replace, item)
+                elif isinstance(item, (dict, list)):
+                    node[key] = child = item.copy()
+                    stack.append(child)
+        
+        return root
     
     def _load_config(self):
         """Load and parse YAML configuration file"""
@@ -106,14 +185,12 @@ class ConfigManager:
             return
         
         try:
-            with open(self.config_path, 'r') as file:
-                raw_config = yaml.safe_load(file)
-            
-            # Substitute environment variables
-            self.config = self._substitute_env_vars(raw_config)
+            with open(self.config_path, 'rb') as file:
+                content = file.read()
+            raw_config = _parse_yaml_cached(content)
             
-            # Validate configuration
-            self._validate_config()
+            # Env substitution still runs on every load, so env changes are picked up
+            self._apply_config(raw_config)
             
             logger.info(f"Successfully loaded configuration from {self.config_path}")
             
@@ -124,6 +201,55 @@ class ConfigManager:
             logger.error(f"Error loading configuration: {e}")
             raise
     
+    def _apply_config(self, raw_config: Dict[str, Any]):
+        """Substitute environment variables in a parsed configuration and validate it"""
+        # Substitution copies every container, so the shared parse-cache document is never handed out
+        self.config = self._substitute_env_vars(raw_config)
+        self._validate_config()
+    
+    @classmethod
+    def from_dict(cls, raw_config: Dict[str, Any], env_file: str = ".env") -> 'ConfigManager':
+        """
+        Create configuration manager from an already-parsed configuration dictionary
+        
+        Args:
+            raw_config: Configuration dictionary, may contain ${VAR} placeholders
+            env_file: Path to environment file
+        """
+        return cls(config_path=None, env_file=env_file, raw_config=raw_config)
+    
+    @classmethod
+    def from_stream(cls, stream: IO, env_file: str = ".env") -> 'ConfigManager':
+        """
+        Create configuration manager from a YAML stream instead of a file path
+        
+        Args:
+            stream: Text or binary file-like object containing YAML
+            env_file: Path to environment file
+        """
+        try:
+            raw_config = yaml.load(stream, Loader=_YAML_LOADER)
+        except yaml.YAMLError as e:
+            logger.error(f"Error parsing YAML configuration: {e}")
+            raise
+        return cls.from_dict(raw_config, env_file)
+    
+    @classmethod
+    def from_string(cls, yaml_text: str, env_file: str = ".env") -> 'ConfigManager':
+        """
+        Create configuration manager from YAML text without touching the filesystem
+        
+        Args:
+            yaml_text: YAML document as a string
+            env_file: Path to environment file
+        """
+        try:
+            raw_config = yaml.load(yaml_text, Loader=_YAML_LOADER)
+        except yaml.YAMLError as e:
+            logger.error(f"Error parsing YAML configuration: {e}")
+            raise
+        return cls.from_dict(raw_config, env_file)
+    
     def _create_default_config(self):
         """Create a default configuration if none exists"""
         self.config = {
@@ -161,27 +287,35 @@ class ConfigManager:
         logger.warning("Using default configuration")
     
     def _validate_config(self):
-        """Validate configuration structure and values"""
-        required_sections = ['servers', 'bot', 'logging', 'media', 'commands', 'security']
+        """Validate the loaded configuration"""
+        self._validate(self.config)
+    
+    @staticmethod
+    def _validate(config: Dict[str, Any]):
+        """
+        Validate configuration structure and values
         
-        for section in required_sections:
-            if section not in self.config:
+        Args:
+            config: Configuration dictionary after environment substitution
+        """
+        for section in REQUIRED_SECTIONS:
+            if section not in config:
                 logger.error(f"Missing required configuration section: {section}")
                 raise ValueError(f"Missing configuration section: {section}")
         
         # Validate servers
-        if not self.config['servers'].get('smp'):
+        if not config['servers'].get('smp'):
             logger.error("No SMP servers configured")
             raise ValueError("At least one SMP server must be configured")
         
         # Validate websocket URL
-        websocket_url = self.config['bot'].get('websocket_url')
+        websocket_url = config['bot'].get('websocket_url')
         if not websocket_url or not websocket_url.startswith('ws://'):
             logger.error("Invalid WebSocket URL configuration")
             raise ValueError("WebSocket URL must start with ws://")
         
-        # Validate media settings
-        media_path = self.config['media'].get('storage_path')
+        # Validate media settings - checked against the working directory, as FileDownloadManager uses it
+        media_path = config['media'].get('storage_path')
         if media_path and not os.path.exists(os.path.dirname(media_path)):
             logger.warning(f"Media storage directory does not exist: {media_path}")
         
@@ -235,8 +369,14 @@ class ConfigManager:
     
     def reload(self):
         """Reload configuration from file"""
+        if self.config_path is None:
+            # Built from an in-memory configuration - there is no file to re-read
+            logger.warning("No configuration file to reload from, keeping the current configuration")
+            return
+        
         logger.info("Reloading configuration")
         self._load_env_file()
+        # Unchanged file bytes hit the parse cache, so only env substitution and validation rerun
         self._load_config()
     
     def to_dict(self) -> Dict[str, Any]:
@@ -254,22 +394,14 @@ def parse_file_size(size_str: str) -> int:
     Returns:
         Size in bytes
     """
-    size_str = size_str.upper().strip()
-    
-    if size_str.endswith('B'):
-        size_str = size_str[:-1]
-    
-    multipliers = {
-        'K': BYTES_PER_KB,
-        'M': BYTES_PER_KB ** 2,
-        'G': BYTES_PER_KB ** 3,
-        'T': BYTES_PER_KB ** 4
-    }
-    
-    if size_str[-1] in multipliers:
-        return int(float(size_str[:-1]) * multipliers[size_str[-1]])
+    match = FILE_SIZE_PATTERN.match(size_str)
+    if not match:
+        raise ValueError(f"Invalid file size: {size_str!r}")
     
-    return int(size_str)
+    number, unit = match.groups()
+    if not unit:
+        return int(number)
+    return int(float(number) * FILE_SIZE_MULTIPLIERS[unit.upper()])
 
 
 if __name__ == "__main__":
@@ -5,20 +5,43 @@ Handles all file and media download operations
 """
 
 import asyncio
-import copy
+import functools
 import logging
+import os
 import time
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import ClassVar, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 from config_manager import parse_file_size
 from xftp_client import XFTPClient
 
 
+def truncate_data_url(data_url: str) -> str:
+    """Replace the base64 payload of a data URL with a marker, keeping the header for logs"""
+    # The header ends at the first comma - find() stops there instead of splitting the whole payload
+    comma = data_url.find(',')
+    header_part = data_url[:comma] if comma >= 0 else data_url
+    return f"{header_part},<base64_truncated>"
+
+
 class FileDownloadManager:
     """Manages file downloads and media operations for SimpleX Bot"""
     
+    # Extension -> media type, anything not listed is a document
+    _EXT_MAP: ClassVar[Dict[str, str]] = {
+        **dict.fromkeys(('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'), 'image'),
+        **dict.fromkeys(('.mp4', '.avi', '.mov', '.wmv', '.flv', '.webm'), 'video'),
+        **dict.fromkeys(('.mp3', '.wav', '.ogg', '.m4a', '.flac'), 'audio'),
+    }
+    
+    # One-pass filename cleanup: control characters dropped, path separators and shell metacharacters
+    # replaced ('..' is a two-character sequence, so it is still handled with replace())
+    _SANITIZE_TABLE: ClassVar[Dict[int, Optional[str]]] = {
+        **dict.fromkeys(range(32), None),
+        **dict.fromkeys(map(ord, '/\\~|&;`$<>"\':?*'), '_'),
+    }
+    
     def __init__(self, media_config: Dict[str, Any], xftp_client: XFTPClient, logger: logging.Logger):
         self.media_config = media_config
         self.xftp_client = xftp_client
@@ -32,17 +55,35 @@ class FileDownloadManager:
         # Create media subdirectories
         for media_type in ['images', 'videos', 'documents', 'audio']:
             (self.media_path / media_type).mkdir(exist_ok=True)
+        
+        # Parsed size limit together with the raw value it came from
+        self._max_file_size_raw = None
+        self._max_file_size_bytes = 0
+    
+    @property
+    def max_file_size(self) -> int:
+        """Largest downloadable file in bytes, re-parsed only when the media config value changes"""
+        raw = self.media_config.get('max_file_size', '100MB')
+        if raw != self._max_file_size_raw:
+            self._max_file_size_bytes = parse_file_size(raw)
+            self._max_file_size_raw = raw
+        return self._max_file_size_bytes
+    
+    @property
+    def allowed_types(self) -> list:
+        """Media types allowed for download, read from the current media config"""
+        return self.media_config.get('allowed_types', ['image', 'video', 'document', 'audio'])
     
     def clean_content_for_logging(self, content: Dict[str, Any]) -> Dict[str, Any]:
         """Clean base64 data from content structure for safe logging"""
-        content_for_log = copy.deepcopy(content)
-        if 'msgContent' in content_for_log and 'image' in content_for_log['msgContent']:
-            image_data = content_for_log['msgContent']['image']
+        msg_content = content.get('msgContent')
+        if isinstance(msg_content, dict):
+            image_data = msg_content.get('image')
             if isinstance(image_data, str) and image_data.startswith('data:image/'):
-                # Truncate base64 data
-                header_part = image_data.split(',')[0] if ',' in image_data else image_data
-                content_for_log['msgContent']['image'] = f"{header_part},<base64_truncated>"
-        return content_for_log
+                # Truncate base64 data - only the two dicts on the path to the image are copied,
+                # every other branch is shared with the original instead of deep-copying the payload
+                return {**content, 'msgContent': {**msg_content, 'image': truncate_data_url(image_data)}}
+        return content
     
     def extract_file_info_from_content(self, file_info: Dict[str, Any], inner_msg_type: str, contact_name: str) -> Tuple[str, int, str]:
         """Extract file information from message content"""
@@ -130,13 +171,12 @@ class FileDownloadManager:
             raise MediaProcessingError("Invalid filename")
         
         # Check file size limit
-        max_size = parse_file_size(self.media_config.get('max_file_size', '100MB'))
-        if file_size > max_size:
+        if file_size > self.max_file_size:
             self.logger.warning(f"File too large: {file_name} ({file_size} bytes)")
             return False
         
         # Check if file type is allowed
-        if file_type not in self.media_config.get('allowed_types', ['image', 'video', 'document', 'audio']):
+        if file_type not in self.allowed_types:
             self.logger.warning(f"File type not allowed: {file_name}")
             return False
         
@@ -154,49 +194,45 @@ class FileDownloadManager:
         }
         
         try:
+            total_bytes = 0
             for media_type in ['images', 'videos', 'documents', 'audio']:
                 media_dir = self.media_path / media_type
                 if media_dir.exists():
-                    files = list(media_dir.glob('*'))
-                    stats[media_type] = len(files)
-                    stats['total_files'] += len(files)
-                    
-                    # Calculate total size
-                    for file_path in files:
-                        if file_path.is_file():
-                            stats['total_size_mb'] += file_path.stat().st_size / (1024 * 1024)
+                    count, size = self._scan_media_dir(media_dir)
+                    stats[media_type] = count
+                    stats['total_files'] += count
+                    total_bytes += size
+            
+            # Calculate total size
+            stats['total_size_mb'] = total_bytes / (1024 * 1024)
         
         except Exception as e:
             self.logger.error(f"Error calculating media statistics: {e}")
         
         return stats
     
+    @staticmethod
+    def _scan_media_dir(media_dir: Path) -> Tuple[int, int]:
+        """Count the entries in a media directory and total the bytes of its regular files"""
+        count = 0
+        size = 0
+        # scandir hands back cached file types, so only regular files cost a stat call
+        with os.scandir(media_dir) as entries:
+            for entry in entries:
+                count += 1
+                if entry.is_file():
+                    size += entry.stat().st_size
+        return count, size
+    
     def _get_file_type(self, filename: str) -> str:
         """Determine file type from filename extension"""
-        ext = Path(filename).suffix.lower()
-        
-        image_exts = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}
-        video_exts = {'.mp4', '.avi', '.mov', '.wmv', '.flv', '.webm'}
-        audio_exts = {'.mp3', '.wav', '.ogg', '.m4a', '.flac'}
-        
-        if ext in image_exts:
-            return 'image'
-        elif ext in video_exts:
-            return 'video'
-        elif ext in audio_exts:
-            return 'audio'
-        else:
-            return 'document'
+        return self._EXT_MAP.get(Path(filename).suffix.lower(), 'document')
     
-    def _sanitize_filename(self, filename: str) -> str:
+    @staticmethod
+    def _sanitize_filename(filename: str) -> str:
         """Sanitize filename to prevent security issues"""
-        # Remove null bytes and control characters
-        filename = ''.join(char for char in filename if ord(char) >= 32)
-        
-        # Remove path separators and dangerous characters
-        forbidden_chars = ['/', '\\', '..', '~', '|', '&', ';', '`', '$', '<', '>', '"', "'", ':', '?', '*']
-        for char in forbidden_chars:
-            filename = filename.replace(char, '_')
+        # Remove null bytes and control characters, replace path separators and dangerous characters
+        filename = filename.translate(FileDownloadManager._SANITIZE_TABLE).replace('..', '_')
         
         # Limit length
         if len(filename) > 255:
@@ -212,6 +248,19 @@ class FileDownloadManager:
         
         return filename
     
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _sanitize_components(original_name: str, contact_name: str) -> Tuple[str, str, str]:
+        """Sanitized (contact, stem, suffix) for generate_safe_filename - everything but the timestamp"""
+        safe_name = FileDownloadManager._sanitize_filename(original_name)
+        if not safe_name:
+            safe_name = "unknown_file"
+        safe_contact = FileDownloadManager._sanitize_filename(contact_name)[:20]
+        
+        # Split filename and extension
+        safe_path = Path(safe_name)
+        return safe_contact, safe_path.stem, safe_path.suffix
+    
     def generate_safe_filename(self, original_name: str, contact_name: str, file_type: str) -> str:
         """Generate a safe, unique filename to avoid conflicts"""
         # Input validation
@@ -222,18 +271,11 @@ class FileDownloadManager:
         if not isinstance(file_type, str):
             file_type = "unknown"
         
-        # Sanitize the original filename
-        safe_name = self._sanitize_filename(original_name)
-        if not safe_name:
-            safe_name = "unknown_file"
+        # Sanitization is cached per (file, contact) pair - the same senders and names recur constantly
+        safe_contact, name_part, ext_part = self._sanitize_components(original_name, contact_name)
         
         # Add timestamp and contact info for uniqueness
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_contact = self._sanitize_filename(contact_name)[:20]
-        
-        # Split filename and extension
-        name_part = Path(safe_name).stem
-        ext_part = Path(safe_name).suffix
         
         # Create unique filename
         unique_name = f"{timestamp}_{safe_contact}_{name_part}{ext_part}"
@@ -283,13 +325,16 @@ class FileDownloadManager:
             if not data_url.startswith("data:"):
                 return 0
             
-            # Extract base64 part after the comma
-            if "," in data_url:
-                base64_data = data_url.split(",", 1)[1]
-                # Calculate approximate size (base64 is ~4/3 the size of original data)
-                # Remove any padding characters for accurate calculation
-                base64_clean = base64_data.rstrip("=")
-                original_size = (len(base64_clean) * 3) // 4
+            # The base64 part starts after the comma
+            comma = data_url.find(",")
+            if comma >= 0:
+                # Work on indices rather than slicing a copy of a multi-megabyte payload
+                # Padding characters are excluded for an accurate size
+                end = len(data_url)
+                while end > comma + 1 and data_url[end - 1] == "=":
+                    end -= 1
+                # base64 is ~4/3 the size of original data
+                original_size = ((end - comma - 1) * 3) // 4
                 
                 self.logger.debug(f"Calculated data URL size: {original_size} bytes")
                 return original_size
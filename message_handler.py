@@ -9,7 +9,7 @@ import time
 from typing import Dict, Any, Optional, Callable, List
 from datetime import datetime
 
-from file_download_manager import FileDownloadManager
+from file_download_manager import FileDownloadManager, truncate_data_url
 from message_context import MessageContext
 from background_task_processor import BackgroundTaskProcessor
 
@@ -447,8 +447,7 @@ class MessageHandler:
             self.logger.info(f"📁 DOWNLOAD DEBUG: File validation result: {is_valid}")
             
             if not is_valid:
-                from config_manager import parse_file_size
-                max_size = parse_file_size(self.file_download_manager.media_config.get('max_file_size', '100MB'))
+                max_size = self.file_download_manager.max_file_size
                 self.logger.warning(f"📁 DOWNLOAD DEBUG: File validation failed - size: {file_size}, max: {max_size}")
                 if file_size > max_size:
                     await self.send_routed_message(message_data, contact_name, f"File {file_name} is too large to download")
@@ -491,8 +490,7 @@ class MessageHandler:
             file_info_for_log = dict(file_info)
             if 'image' in file_info_for_log and isinstance(file_info_for_log['image'], str):
                 if file_info_for_log['image'].startswith('data:image/'):
-                    header_part = file_info_for_log['image'].split(',')[0] if ',' in file_info_for_log['image'] else file_info_for_log['image']
-                    file_info_for_log['image'] = f"{header_part},<base64_truncated>"
+                    file_info_for_log['image'] = truncate_data_url(file_info_for_log['image'])
             
             self.logger.info(f"🔍 DOWNLOAD: Full file_info: {file_info_for_log}")
             
@@ -45,6 +45,10 @@ case "${1:-all}" in
         echo "📈 Running tests with coverage report..."
         run_tests "coverage" "tests/ --cov=. --cov-report=term-missing --cov-report=html"
         ;;
+    "parallel")
+        echo "🚀 Running all tests in parallel..."
+        run_tests "parallel" "tests/ -n auto"
+        ;;
     "quick")
         echo "⚡ Running quick tests only..."
         run_tests "quick" "tests/ -v -m 'not slow'"
@@ -64,6 +68,7 @@ case "${1:-all}" in
         echo "  verbose     - Run all tests with verbose output"
         echo "  coverage    - Run tests with coverage report"
         echo "  quick       - Run quick tests only (skip slow tests)"
+        echo "  parallel    - Run all tests across CPU cores (pytest-xdist)"
         echo "  help        - Show this help message"
         echo ""
         echo "Examples:"
@@ -3,85 +3,112 @@ Pytest configuration and fixtures for SimpleX Bot tests
 """
 
 import pytest
-import tempfile
+import copy
+import io
+import itertools
+import logging
 import os
 import yaml
-from pathlib import Path
 from unittest.mock import patch
 
+from yaml_io import DUMPER as _DUMPER
+
+try:
+    import orjson
+
+    def _clone(data):
+        """Deep-copy JSON-compatible fixture data through orjson's C encoder and decoder"""
+        return orjson.loads(orjson.dumps(data))
+except ImportError:
+    _clone = copy.deepcopy
+
+
+_config_dir_ids = itertools.count()
+
+
+@pytest.fixture(scope="module")
+def temp_config_root(tmp_path_factory):
+    """One temporary directory per test module, removed by pytest's own tmp_path cleanup"""
+    return tmp_path_factory.mktemp("cfg_root")
+
 
 @pytest.fixture
-def temp_config_dir():
-    """Create a temporary directory for test configuration files"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        yield Path(temp_dir)
+def temp_config_dir(temp_config_root, request):
+    """Create a fresh directory for test configuration files inside the module's root"""
+    config_dir = temp_config_root / f"{request.node.originalname}_{next(_config_dir_ids)}"
+    config_dir.mkdir()
+    return config_dir
+
+
+_SAMPLE_CONFIG = {
+    'servers': {
+        'smp': ['${SMP_SERVER_1}', '${SMP_SERVER_2:-}'],
+        'xftp': ['${XFTP_SERVER_1}', '${XFTP_SERVER_2:-}']
+    },
+    'bot': {
+        'name': '${BOT_NAME:-SimpleX Bot}',
+        'websocket_url': '${WEBSOCKET_URL:-ws://localhost:3030}',
+        'auto_accept_contacts': '${AUTO_ACCEPT_CONTACTS:-true}'
+    },
+    'logging': {
+        'daily_rotation': True,
+        'message_log_separate': True,
+        'retention_days': '${LOG_RETENTION_DAYS:-30}',
+        'log_level': '${LOG_LEVEL:-INFO}'
+    },
+    'media': {
+        'download_enabled': '${MEDIA_DOWNLOAD_ENABLED:-true}',
+        'max_file_size': '${MAX_FILE_SIZE:-100MB}',
+        'allowed_types': ['image', 'video', 'document', 'audio'],
+        'storage_path': '${MEDIA_STORAGE_PATH:-./media}'
+    },
+    'commands': {
+        'enabled': ['help', 'echo', 'status'],
+        'prefix': '!'
+    },
+    'security': {
+        'max_message_length': '${MAX_MESSAGE_LENGTH:-4096}',
+        'rate_limit_messages': '${RATE_LIMIT_MESSAGES:-10}',
+        'rate_limit_window': '${RATE_LIMIT_WINDOW:-60}'
+    }
+}
+
+_SAMPLE_ENV_VARS = {
+    'SMP_SERVER_1': 'smp://test-server1.com',
+    'SMP_SERVER_2': 'smp://test-server2.com',
+    'XFTP_SERVER_1': 'xftp://test-files1.com',
+    'XFTP_SERVER_2': 'xftp://test-files2.com',
+    'BOT_NAME': 'Test Bot',
+    'WEBSOCKET_URL': 'ws://test:3030',
+    'AUTO_ACCEPT_CONTACTS': 'false',
+    'LOG_RETENTION_DAYS': '7',
+    'LOG_LEVEL': 'DEBUG',
+    'MEDIA_DOWNLOAD_ENABLED': 'true',
+    'MAX_FILE_SIZE': '50MB',
+    'MEDIA_STORAGE_PATH': './test_media',
+    'MAX_MESSAGE_LENGTH': '2048',
+    'RATE_LIMIT_MESSAGES': '5',
+    'RATE_LIMIT_WINDOW': '30'
+}
 
 
 @pytest.fixture
 def sample_config_dict():
     """Sample configuration dictionary for testing"""
-    return {
-        'servers': {
-            'smp': ['${SMP_SERVER_1}', '${SMP_SERVER_2:-}'],
-            'xftp': ['${XFTP_SERVER_1}', '${XFTP_SERVER_2:-}']
-        },
-        'bot': {
-            'name': '${BOT_NAME:-SimpleX Bot}',
-            'websocket_url': '${WEBSOCKET_URL:-ws://localhost:3030}',
-            'auto_accept_contacts': '${AUTO_ACCEPT_CONTACTS:-true}'
-        },
-        'logging': {
-            'daily_rotation': True,
-            'message_log_separate': True,
-            'retention_days': '${LOG_RETENTION_DAYS:-30}',
-            'log_level': '${LOG_LEVEL:-INFO}'
-        },
-        'media': {
-            'download_enabled': '${MEDIA_DOWNLOAD_ENABLED:-true}',
-            'max_file_size': '${MAX_FILE_SIZE:-100MB}',
-            'allowed_types': ['image', 'video', 'document', 'audio'],
-            'storage_path': '${MEDIA_STORAGE_PATH:-./media}'
-        },
-        'commands': {
-            'enabled': ['help', 'echo', 'status'],
-            'prefix': '!'
-        },
-        'security': {
-            'max_message_length': '${MAX_MESSAGE_LENGTH:-4096}',
-            'rate_limit_messages': '${RATE_LIMIT_MESSAGES:-10}',
-            'rate_limit_window': '${RATE_LIMIT_WINDOW:-60}'
-        }
-    }
+    return _clone(_SAMPLE_CONFIG)
 
 
 @pytest.fixture
 def sample_env_vars():
     """Sample environment variables for testing"""
-    return {
-        'SMP_SERVER_1': 'smp://test-server1.com',
-        'SMP_SERVER_2': 'smp://test-server2.com',
-        'XFTP_SERVER_1': 'xftp://test-files1.com',
-        'XFTP_SERVER_2': 'xftp://test-files2.com',
-        'BOT_NAME': 'Test Bot',
-        'WEBSOCKET_URL': 'ws://test:3030',
-        'AUTO_ACCEPT_CONTACTS': 'false',
-        'LOG_RETENTION_DAYS': '7',
-        'LOG_LEVEL': 'DEBUG',
-        'MEDIA_DOWNLOAD_ENABLED': 'true',
-        'MAX_FILE_SIZE': '50MB',
-        'MEDIA_STORAGE_PATH': './test_media',
-        'MAX_MESSAGE_LENGTH': '2048',
-        'RATE_LIMIT_MESSAGES': '5',
-        'RATE_LIMIT_WINDOW': '30'
-    }
+    return dict(_SAMPLE_ENV_VARS)
 
 
 @pytest.fixture
-def config_file(temp_config_dir, sample_config_dict):
+def config_file(temp_config_dir):
     """Create a temporary config.yml file"""
     config_path = temp_config_dir / "config.yml"
-    with open(config_path, 'w') as f:
-        yaml.dump(sample_config_dict, f)
+    config_path.write_text(_SAMPLE_YAML)
     return config_path
 
 
@@ -95,58 +122,211 @@ def env_file(temp_config_dir, sample_env_vars):
     return env_path
 
 
+@pytest.fixture(scope="class")
+def sample_config_manager(tmp_path_factory):
+    """ConfigManager built once per test class from the sample config and .env - treat as read-only"""
+    from config_manager import ConfigManager
+    
+    config_dir = tmp_path_factory.mktemp("sample_cfg")
+    (config_dir / "config.yml").write_text(_SAMPLE_YAML)
+    with open(config_dir / ".env", 'w') as f:
+        for key, value in _SAMPLE_ENV_VARS.items():
+            f.write(f"{key}={value}\n")
+    
+    # Substitution happens during construction; patch.dict also rolls back what the .env load sets
+    with patch.dict(os.environ, _SAMPLE_ENV_VARS, clear=False):
+        return ConfigManager("config.yml", ".env", base_dir=str(config_dir))
+
+
+_MINIMAL_CONFIG = {
+    'servers': {
+        'smp': ['smp://localhost:5223'],
+        'xftp': ['xftp://localhost:5443']
+    },
+    'bot': {
+        'name': 'Test Bot',
+        'websocket_url': 'ws://localhost:3030',
+        'auto_accept_contacts': True
+    },
+    'logging': {
+        'daily_rotation': True,
+        'message_log_separate': True,
+        'retention_days': 30,
+        'log_level': 'INFO'
+    },
+    'media': {
+        'download_enabled': True,
+        'max_file_size': '100MB',
+        'allowed_types': ['image', 'video', 'document'],
+        'storage_path': './media'
+    },
+    'commands': {
+        'enabled': ['help', 'echo', 'status'],
+        'prefix': '!'
+    },
+    'security': {
+        'max_message_length': 4096,
+        'rate_limit_messages': 10,
+        'rate_limit_window': 60
+    }
+}
+
+# Serialized once at import - tests that write the unmodified minimal config reuse it
+_MINIMAL_YAML = yaml.dump(_MINIMAL_CONFIG, Dumper=_DUMPER)
+_SAMPLE_YAML = yaml.dump(_SAMPLE_CONFIG, Dumper=_DUMPER)
+
+
 @pytest.fixture
 def minimal_config():
     """Minimal valid configuration for testing"""
-    return {
-        'servers': {
-            'smp': ['smp://localhost:5223'],
-            'xftp': ['xftp://localhost:5443']
-        },
-        'bot': {
-            'name': 'Test Bot',
-            'websocket_url': 'ws://localhost:3030',
-            'auto_accept_contacts': True
-        },
-        'logging': {
-            'daily_rotation': True,
-            'message_log_separate': True,
-            'retention_days': 30,
-            'log_level': 'INFO'
-        },
-        'media': {
-            'download_enabled': True,
-            'max_file_size': '100MB',
-            'allowed_types': ['image', 'video', 'document'],
-            'storage_path': './media'
-        },
-        'commands': {
-            'enabled': ['help', 'echo', 'status'],
-            'prefix': '!'
-        },
-        'security': {
-            'max_message_length': 4096,
-            'rate_limit_messages': 10,
-            'rate_limit_window': 60
-        }
-    }
+    return _clone(_MINIMAL_CONFIG)
+
+
+@pytest.fixture(scope="session")
+def minimal_config_template():
+    """Shared read-only minimal configuration - merge overrides into a new dict, never mutate"""
+    return _MINIMAL_CONFIG
+
+
+@pytest.fixture
+def minimal_yaml():
+    """Minimal valid configuration as YAML text, ready to write to disk"""
+    return _MINIMAL_YAML
+
+
+@pytest.fixture
+def sample_config_yaml():
+    """Sample configuration as YAML text, ready to write to disk"""
+    return _SAMPLE_YAML
+
+
+@pytest.fixture(scope="session")
+def shared_logger(tmp_path_factory):
+    """Bot logger manager built once per session, for tests that don't inspect logging"""
+    from bot import DailyRotatingLogger
+    
+    # DailyRotatingLogger writes to ./logs, keep it out of the working tree
+    original_cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("shared_logger"))
+    try:
+        return DailyRotatingLogger("SimplexChatBot", "SimplexChatMessages", {})
+    finally:
+        os.chdir(original_cwd)
+
+
+@pytest.fixture
+def bot_workspace(temp_config_dir, monkeypatch):
+    """temp_config_dir prepared as the bot's working directory"""
+    # Plugins directory and version.yml prevent plugin system and !help errors
+    (temp_config_dir / "plugins" / "external").mkdir(parents=True, exist_ok=True)
+    with open(temp_config_dir / "version.yml", 'w') as f:
+        yaml.dump({
+            'bot': {
+                'name': 'Test Bot',
+                'version': '1.0.0',
+                'description': 'Test bot for integration tests',
+                'platform': 'SimpleX'
+            }
+        }, f, Dumper=_DUMPER)
+    
+    monkeypatch.chdir(temp_config_dir)
+    return temp_config_dir
+
+
+@pytest.fixture
+def bot_from_config(bot_workspace, shared_logger):
+    """Factory that writes a config file and builds a bot from inside temp_config_dir"""
+    from bot import SimplexChatBot
+    
+    def _make_bot(config_data, filename="config.yml", own_logger=False):
+        config_path = bot_workspace / filename
+        if isinstance(config_data, str):
+            # Raw YAML text is written verbatim
+            config_path.write_text(config_data)
+        else:
+            with open(config_path, 'w') as f:
+                yaml.dump(config_data, f, Dumper=_DUMPER)
+        return SimplexChatBot(str(config_path), logger_manager=None if own_logger else shared_logger)
+    
+    return _make_bot
+
+
+@pytest.fixture
+def bot_from_stream(bot_workspace, shared_logger):
+    """Factory that builds a bot from an in-memory YAML stream, for tests that don't check the config file"""
+    from bot import SimplexChatBot
+    
+    def _make_bot(config_data, own_logger=False):
+        if not isinstance(config_data, str):
+            config_data = yaml.dump(config_data, Dumper=_DUMPER)
+        return SimplexChatBot.from_stream(io.StringIO(config_data),
+                                          logger_manager=None if own_logger else shared_logger)
+    
+    return _make_bot
+
+
+APP_CONFIG_PATH = "/app/config.yml"
+
+
+@pytest.fixture(scope="session")
+def app_config_manager():
+    """ConfigManager for the container's config file, parsed once per session"""
+    if not os.path.exists(APP_CONFIG_PATH):
+        pytest.skip(f"{APP_CONFIG_PATH} only exists inside the bot container")
+    from config_manager import ConfigManager
+    return ConfigManager(config_path=APP_CONFIG_PATH)
+
+
+@pytest.fixture(scope="session")
+def app_bot(app_config_manager):
+    """Bot built from the container's config once per session, for flow tests that probe handlers"""
+    from bot import SimplexChatBot
+    return SimplexChatBot(config_manager=app_config_manager)
+
+
+@pytest.fixture(scope="session")
+def silent_logger():
+    """The 'test' logger handed to components, silenced for the tests that request it and restored afterwards"""
+    logger = logging.getLogger('test')
+    handler = logging.NullHandler()
+    previous_level, previous_propagate = logger.level, logger.propagate
+    logger.addHandler(handler)
+    logger.propagate = False
+    logger.setLevel(logging.CRITICAL)
+    yield logger
+    logger.removeHandler(handler)
+    logger.propagate = previous_propagate
+    logger.setLevel(previous_level)
+
+
+@pytest.fixture(scope="session")
+def admin_manager(silent_logger):
+    """AdminManager loaded once per session - tests must not modify it"""
+    from admin_manager import AdminManager
+    return AdminManager(logger=silent_logger)
+
+
+@pytest.fixture
+def command_registry(admin_manager, silent_logger):
+    """Fresh CommandRegistry per test, so registrations don't leak between tests"""
+    from bot import CommandRegistry
+    return CommandRegistry(silent_logger, admin_manager)
 
 
 @pytest.fixture
 def invalid_config():
-    """Invalid configuration for testing validation"""
-    return {
-        'servers': {
-            'smp': [],  # Empty SMP servers - should fail validation
-            'xftp': ['xftp://localhost:5443']
-        },
-        'bot': {
-            'name': 'Test Bot',
-            'websocket_url': 'invalid://url',  # Invalid WebSocket URL
-            'auto_accept_contacts': True
-        }
+    """Invalid configuration YAML for testing validation, written to disk as-is"""
+    return (
+        "servers:\n"
+        "  smp: []\n"  # Empty SMP servers - should fail validation
+        "  xftp:\n"
+        "  - xftp://localhost:5443\n"
+        "bot:\n"
+        "  name: Test Bot\n"
+        "  websocket_url: invalid://url\n"  # Invalid WebSocket URL
+        "  auto_accept_contacts: true\n"
         # Missing required sections
-    }
+    )
 
 
 @pytest.fixture
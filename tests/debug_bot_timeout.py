@@ -4,10 +4,13 @@ Debug the exact bot timeout issue by simulating the bot's command flow
 """
 
 import asyncio
-import json
-import websockets
+import logging
 import time
 
+from ws_json import CONNECT_OPTIONS, dumps as _dumps, loads as _loads, run
+
+log = logging.getLogger(__name__)
+
 class MockWebSocketManager:
     def __init__(self):
         self.websocket = None
@@ -19,6 +22,34 @@ class MockWebSocketManager:
         self.correlation_counter += 1
         return f"bot_req_{int(time.time())}_{self.correlation_counter}"
 
+    async def _await_reply(self, websocket, corr_id: str) -> bool:
+        """Receive until the reply for corr_id arrives, storing it like the bot does"""
+        while True:
+            try:
+                raw_response = await websocket.recv()
+                print(f"🔧 DEBUG: Received raw response: {raw_response[:100]}...")
+                
+                # Parse the response
+                response_data = _loads(raw_response)
+                response_corr_id = response_data.get("corrId")
+                
+                print(f"🔧 DEBUG: Response correlation ID: {response_corr_id}")
+                
+                if response_corr_id == corr_id:
+                    print(f"✅ DEBUG: Correlation ID matches!")
+                    # Store the response (like the bot does)
+                    self.pending_requests[f"{corr_id}_response"] = response_data
+                    # Remove the pending request
+                    del self.pending_requests[corr_id]
+                    return True
+                else:
+                    print(f"⚠️ DEBUG: Correlation ID mismatch - ignoring")
+                    
+            except Exception as e:
+                print(f"❌ DEBUG: Error receiving response: {e}")
+                # Back off only on errors - the caller's deadline bounds the whole wait
+                await asyncio.sleep(0.1)
+
     async def send_command_with_debug(self, websocket, command: str) -> dict:
         """Send command exactly like the bot does with detailed logging"""
         print(f"🔧 DEBUG: Starting send_command for '{command}'")
@@ -37,55 +68,26 @@ class MockWebSocketManager:
         
         try:
             # Send the command
-            await websocket.send(json.dumps(message))
+            await websocket.send(_dumps(message))
             print(f"🔧 DEBUG: Command sent successfully")
             
             # Store the request for correlation (like the bot does)
             self.pending_requests[corr_id] = {"command": command, "timestamp": time.time()}
             print(f"🔧 DEBUG: Stored pending request for {corr_id}")
             
-            # Wait for response with timeout (like the bot does)
+            # Wait for response with timeout (like the bot does) - one deadline around a
+            # continuous recv loop, so the reply is handled the moment it arrives
             timeout = 30
-            start_time = time.time()
             
             print(f"🔧 DEBUG: Starting wait loop for response...")
             
-            response_received = False
-            while corr_id in self.pending_requests:
-                if time.time() - start_time > timeout:
-                    print(f"⏰ DEBUG: Timeout reached after {timeout} seconds")
-                    del self.pending_requests[corr_id]
-                    return None
-                
-                # Check if response arrived by manually checking for it
-                try:
-                    raw_response = await asyncio.wait_for(websocket.recv(), timeout=0.1)
-                    print(f"🔧 DEBUG: Received raw response: {raw_response[:100]}...")
-                    
-                    # Parse the response
-                    response_data = json.loads(raw_response)
-                    response_corr_id = response_data.get("corrId")
-                    
-                    print(f"🔧 DEBUG: Response correlation ID: {response_corr_id}")
-                    
-                    if response_corr_id == corr_id:
-                        print(f"✅ DEBUG: Correlation ID matches!")
-                        # Store the response (like the bot does)
-                        self.pending_requests[f"{corr_id}_response"] = response_data
-                        # Remove the pending request
-                        del self.pending_requests[corr_id]
-                        response_received = True
-                        break
-                    else:
-                        print(f"⚠️ DEBUG: Correlation ID mismatch - ignoring")
-                        
-                except asyncio.TimeoutError:
-                    # No message received in 0.1 seconds, continue waiting
-                    pass
-                except Exception as e:
-                    print(f"❌ DEBUG: Error receiving response: {e}")
-                
-                await asyncio.sleep(0.1)
+            try:
+                response_received = await asyncio.wait_for(
+                    self._await_reply(websocket, corr_id), timeout=timeout)
+            except asyncio.TimeoutError:
+                print(f"⏰ DEBUG: Timeout reached after {timeout} seconds")
+                del self.pending_requests[corr_id]
+                return None
             
             if response_received:
                 # Get the stored response (like the bot does)
@@ -102,6 +104,8 @@ class MockWebSocketManager:
 
 async def debug_contacts_timeout():
     """Debug the exact timeout issue with !contacts list"""
+    import websockets
+    
     uri = "ws://localhost:3030"
     
     try:
@@ -109,7 +113,7 @@ async def debug_contacts_timeout():
         
         mock_manager = MockWebSocketManager()
         
-        async with websockets.connect(uri) as websocket:
+        async with websockets.connect(uri, **CONNECT_OPTIONS) as websocket:
             print("✅ DEBUG: Connected to SimpleX CLI WebSocket")
             
             # Test the exact flow the bot uses for !contacts list
@@ -141,9 +145,7 @@ async def debug_contacts_timeout():
                 print(f"❌ DEBUG: Command failed/timed out!")
                 
     except Exception as e:
-        print(f"❌ DEBUG: Error: {type(e).__name__}: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("❌ DEBUG: Error: %s: %s", type(e).__name__, e)
 
 if __name__ == "__main__":
-    asyncio.run(debug_contacts_timeout())
\ No newline at end of file
+    run(debug_contacts_timeout())
\ No newline at end of file
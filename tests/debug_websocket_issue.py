@@ -4,96 +4,131 @@ Debug the WebSocket connection issue - why does CLI respond to direct connection
 """
 
 import asyncio
-import json
-import websockets
+import itertools
 import time
 
-async def compare_websocket_connections():
-    """Compare direct WebSocket vs bot's WebSocket behavior"""
-    uri = "ws://localhost:3030"
-    
-    print("🔍 DEBUGGING: WebSocket connection differences")
-    print("=" * 60)
-    
-    # Test 1: Direct connection (this works)
+from ws_json import CONNECT_OPTIONS, dumps as _dumps, loads as _loads, run
+
+# One timestamp per run; the counter keeps correlation IDs unique
+_BASE = int(time.time())
+_counter = itertools.count()
+
+async def _test_direct_connection(ws):
+    """TEST 1: Direct connection (this works)"""
     print("\n🧪 TEST 1: Direct WebSocket connection (like my tests)...")
     try:
-        async with websockets.connect(uri) as ws:
-            corr_id = f"direct_test_{int(time.time())}"
-            message = {"corrId": corr_id, "cmd": "/contacts"}
-            
-            start_time = time.time()
-            await ws.send(json.dumps(message))
-            
-            response = await asyncio.wait_for(ws.recv(), timeout=10.0)
-            elapsed = time.time() - start_time
-            
-            resp_data = json.loads(response)
-            print(f"✅ Direct connection: Response in {elapsed:.3f}s")
-            print(f"   Correlation ID: {resp_data.get('corrId')}")
-            print(f"   Response type: {resp_data.get('resp', {}).get('Right', {}).get('type', 'unknown')}")
-            
+        corr_id = f"direct_test_{_BASE}_{next(_counter)}"
+        message = {"corrId": corr_id, "cmd": "/contacts"}
+        
+        start_time = time.time()
+        await ws.send(_dumps(message))
+        
+        async with asyncio.timeout(10.0):
+            response = await ws.recv()
+        elapsed = time.time() - start_time
+        
+        resp_data = _loads(response)
+        print(f"✅ Direct connection: Response in {elapsed:.3f}s")
+        print(f"   Correlation ID: {resp_data.get('corrId')}")
+        print(f"   Response type: {resp_data.get('resp', {}).get('Right', {}).get('type', 'unknown')}")
+        
     except Exception as e:
         print(f"❌ Direct connection failed: {e}")
+
+async def _test_multiple_connections(ws1, uri):
+    """TEST 2: Check if there are multiple connections"""
+    import websockets
     
-    # Test 2: Check if there are multiple connections
     print(f"\n🧪 TEST 2: Multiple connections test...")
     try:
-        # Open two connections simultaneously
-        async with websockets.connect(uri) as ws1, websockets.connect(uri) as ws2:
+        # Open a second connection alongside the shared one
+        async with websockets.connect(uri, **CONNECT_OPTIONS) as ws2:
             print("✅ Two WebSocket connections opened simultaneously")
             
             # Send command on first connection
-            corr_id1 = f"multi_test1_{int(time.time())}"
+            corr_id1 = f"multi_test1_{_BASE}_{next(_counter)}"
             message1 = {"corrId": corr_id1, "cmd": "/contacts"}
-            await ws1.send(json.dumps(message1))
+            await ws1.send(_dumps(message1))
             
             # Send command on second connection
-            corr_id2 = f"multi_test2_{int(time.time())}"
+            corr_id2 = f"multi_test2_{_BASE}_{next(_counter)}"
             message2 = {"corrId": corr_id2, "cmd": "/help"}
-            await ws2.send(json.dumps(message2))
+            await ws2.send(_dumps(message2))
             
             # Try to receive from both
             try:
-                resp1 = await asyncio.wait_for(ws1.recv(), timeout=5.0)
-                print("✅ First connection got response")
-            except asyncio.TimeoutError:
+                async with asyncio.timeout(5.0):
+                    resp1 = await ws1.recv()
+                resp_corr_id = _loads(resp1).get('corrId')
+                if resp_corr_id == corr_id1:
+                    print("✅ First connection got response")
+                else:
+                    print(f"❌ First connection got corrId {resp_corr_id}, expected {corr_id1}")
+            except TimeoutError:
                 print("❌ First connection timed out")
             
             try:
-                resp2 = await asyncio.wait_for(ws2.recv(), timeout=5.0)
-                print("✅ Second connection got response") 
-            except asyncio.TimeoutError:
+                async with asyncio.timeout(5.0):
+                    resp2 = await ws2.recv()
+                resp_corr_id = _loads(resp2).get('corrId')
+                if resp_corr_id == corr_id2:
+                    print("✅ Second connection got response")
+                else:
+                    print(f"❌ Second connection got corrId {resp_corr_id}, expected {corr_id2}")
+            except TimeoutError:
                 print("❌ Second connection timed out")
                 
     except Exception as e:
         print(f"❌ Multiple connections test failed: {e}")
-    
-    # Test 3: Check connection persistence
+
+async def _test_long_lived_connection(ws):
+    """TEST 3: Check connection persistence"""
     print(f"\n🧪 TEST 3: Long-lived connection test...")
     try:
-        async with websockets.connect(uri) as ws:
-            print("✅ Long-lived connection opened")
+        print("✅ Long-lived connection opened")
+        
+        # Send multiple commands over time
+        for i in range(3):
+            corr_id = f"persistent_test_{i}_{_BASE}"
+            message = {"corrId": corr_id, "cmd": "/help"}
             
-            # Send multiple commands over time
-            for i in range(3):
-                corr_id = f"persistent_test_{i}_{int(time.time())}"
-                message = {"corrId": corr_id, "cmd": "/help"}
-                
-                start_time = time.time()
-                await ws.send(json.dumps(message))
-                
-                try:
-                    response = await asyncio.wait_for(ws.recv(), timeout=5.0)
-                    elapsed = time.time() - start_time
+            start_time = time.time()
+            await ws.send(_dumps(message))
+            
+            try:
+                async with asyncio.timeout(5.0):
+                    response = await ws.recv()
+                elapsed = time.time() - start_time
+                resp_corr_id = _loads(response).get('corrId')
+                if resp_corr_id == corr_id:
                     print(f"✅ Command {i+1}: Response in {elapsed:.3f}s")
-                except asyncio.TimeoutError:
-                    print(f"❌ Command {i+1}: Timed out")
-                
-                await asyncio.sleep(1)
-                
+                else:
+                    print(f"❌ Command {i+1}: Got corrId {resp_corr_id}, expected {corr_id}")
+            except TimeoutError:
+                print(f"❌ Command {i+1}: Timed out")
+            
+            await asyncio.sleep(1)
+            
     except Exception as e:
         print(f"❌ Long-lived connection test failed: {e}")
+
+async def compare_websocket_connections():
+    """Compare direct WebSocket vs bot's WebSocket behavior"""
+    import websockets
+    
+    uri = "ws://localhost:3030"
+    
+    print("🔍 DEBUGGING: WebSocket connection differences")
+    print("=" * 60)
+    
+    # One handshake shared by all subtests
+    try:
+        async with websockets.connect(uri, **CONNECT_OPTIONS) as ws:
+            await _test_direct_connection(ws)
+            await _test_multiple_connections(ws, uri)
+            await _test_long_lived_connection(ws)
+    except Exception as e:
+        print(f"❌ Could not connect to {uri}: {e}")
     
     print(f"\n🔍 ANALYSIS:")
     print(f"- Bot's WebSocket ID: 139656541470416 (from logs)")
@@ -107,4 +142,4 @@ async def compare_websocket_connections():
     print(f"3. There might be a message queue or correlation ID conflict")
 
 if __name__ == "__main__":
-    asyncio.run(compare_websocket_connections())
\ No newline at end of file
+    run(compare_websocket_connections())
\ No newline at end of file
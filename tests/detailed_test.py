@@ -5,29 +5,49 @@ Get detailed structure of contacts and groups responses
 
 import asyncio
 import json
-import websockets
 import time
 
+from ws_json import CONNECT_OPTIONS, dumps as _dumps, loads as _loads, run
+
+async def send_batch(websocket, messages):
+    """Serialize every message up front, then write them back-to-back"""
+    # The CLI takes one command per frame, so a JSON array would be rejected
+    frames = [_dumps(message) for message in messages]
+    for frame in frames:
+        await websocket.send(frame)
+
 async def get_detailed_responses():
     """Get full responses to understand data structure"""
+    import websockets
+    
     uri = "ws://localhost:3030"
     
     try:
         print(f"Connecting to {uri}...")
-        async with websockets.connect(uri) as websocket:
+        async with websockets.connect(uri, **CONNECT_OPTIONS) as websocket:
             print("✅ Connected to SimpleX CLI WebSocket")
             
-            # Test /contacts command
-            print(f"\n📤 Testing /contacts command...")
-            corr_id = f"test_contacts_{int(time.time())}"
-            message = {"corrId": corr_id, "cmd": "/contacts"}
-            
-            await websocket.send(json.dumps(message))
+            # Both commands go out in one batch; replies are matched by corrId
+            t = int(time.time())
+            contacts_id = f"test_contacts_{t}"
+            groups_id = f"test_groups_{t}"
+            print(f"\n📤 Testing /contacts and /groups commands...")
+            await send_batch(websocket, [
+                {"corrId": contacts_id, "cmd": "/contacts"},
+                {"corrId": groups_id, "cmd": "/groups"},
+            ])
             
+            responses = {}
             try:
-                response = await asyncio.wait_for(websocket.recv(), timeout=10.0)
-                resp_data = json.loads(response)
-                
+                async with asyncio.timeout(10.0):
+                    for _ in range(2):
+                        resp_data = _loads(await websocket.recv())
+                        responses[resp_data.get('corrId')] = resp_data
+            except Exception as e:
+                print(f"Error receiving responses: {e}")
+            
+            resp_data = responses.get(contacts_id)
+            if resp_data is not None:
                 print("Full /contacts response:")
                 print(json.dumps(resp_data, indent=2))
                 
@@ -40,31 +60,14 @@ async def get_detailed_responses():
                         for i, contact in enumerate(contacts):
                             print(f"Contact {i+1}: {json.dumps(contact, indent=2)}")
                             break  # Just show first contact structure
-                    
-            except Exception as e:
-                print(f"Error with /contacts: {e}")
-                
-            await asyncio.sleep(1)
-            
-            # Test /groups command  
-            print(f"\n📤 Testing /groups command...")
-            corr_id = f"test_groups_{int(time.time())}"
-            message = {"corrId": corr_id, "cmd": "/groups"}
             
-            await websocket.send(json.dumps(message))
-            
-            try:
-                response = await asyncio.wait_for(websocket.recv(), timeout=10.0)
-                resp_data = json.loads(response)
-                
+            resp_data = responses.get(groups_id)
+            if resp_data is not None:
                 print("Full /groups response:")
                 print(json.dumps(resp_data, indent=2))
                 
-            except Exception as e:
-                print(f"Error with /groups: {e}")
-                
     except Exception as e:
         print(f"❌ Error: {type(e).__name__}: {e}")
 
 if __name__ == "__main__":
-    asyncio.run(get_detailed_responses())
\ No newline at end of file
+    run(get_detailed_responses())
\ No newline at end of file
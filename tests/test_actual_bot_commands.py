@@ -5,11 +5,41 @@ Test the bot's ACTUAL command processing, not just CLI connectivity
 
 import asyncio
 import json
-import pytest
 from unittest.mock import Mock, patch, AsyncMock
 import time
 
-@pytest.mark.asyncio
+from ws_json import dumps as _dumps, loads as _loads
+
+def _user_message_frame(text, corr_id=""):
+    """JSON frame for an incoming direct text message from a contact"""
+    # A fresh payload per call, so concurrent callers never share corrId or text
+    return _dumps({
+        "corrId": corr_id,
+        "resp": {
+            "Right": {
+                "type": "newChatItem",
+                "chatItem": {
+                    "itemContent": {
+                        "type": "rcvMsgContent",
+                        "msgContent": {"type": "text", "text": text}
+                    }
+                },
+                "chatInfo": {"chatType": "direct", "localDisplayName": "NonpareilMagnitude"}
+            }
+        }
+    })
+
+async def _wait_for_bot_reply(websocket, timeout=2.0):
+    """Drain incoming messages until the bot sends a reply (sndMsgContent)"""
+    async def _drain():
+        while True:
+            resp_data = _loads(await websocket.recv())
+            chat_item = resp_data.get('resp', {}).get('Right', {}).get('chatItem', {})
+            if chat_item.get('itemContent', {}).get('type') == 'sndMsgContent':
+                return resp_data
+    
+    return await asyncio.wait_for(_drain(), timeout=timeout)
+
 async def test_actual_bot_message_processing():
     """Test if the bot can actually process user messages and execute commands"""
     # Mock WebSocket connection for testing
@@ -43,35 +73,16 @@ async def test_actual_bot_message_processing():
         print("✅ Connected to mocked WebSocket")
         
         # Simulate sending a message to the bot
-        user_message = {
-            "corrId": "",
-            "resp": {
-                "Right": {
-                    "type": "newChatItem",
-                    "chatItem": {
-                        "itemContent": {
-                            "type": "rcvMsgContent",
-                            "msgContent": {
-                                "type": "text", 
-                                "text": "!contacts list"
-                            }
-                        }
-                    },
-                    "chatInfo": {
-                        "chatType": "direct",
-                        "localDisplayName": "NonpareilMagnitude"
-                    }
-                }
-            }
-        }
+        payload = _user_message_frame("!contacts list")
+        
+        # Start listening before sending so the reply cannot be missed
+        reply_task = asyncio.create_task(_wait_for_bot_reply(mock_ws, timeout=2.0))
         
         print(f"📤 Sending mocked user message...")
-        await mock_ws.send(json.dumps(user_message))
+        await mock_ws.send(payload)
         
         print(f"⏰ Waiting for mocked bot response...")
-        response = await mock_ws.recv()
-        
-        resp_data = json.loads(response)
+        resp_data = await reply_task
         chat_item = resp_data.get('resp', {}).get('Right', {}).get('chatItem', {})
         content = chat_item.get('itemContent', {})
         
@@ -5,11 +5,11 @@ Test all implemented commands to ensure they work with mocked WebSocket
 
 import asyncio
 import json
-import pytest
 from unittest.mock import patch, AsyncMock
 import time
 
-@pytest.mark.asyncio
+from ws_json import dumps as _dumps, loads as _loads
+
 async def test_all_bot_commands():
     """Test all the bot commands we implemented"""
     
@@ -57,10 +57,10 @@ async def test_all_bot_commands():
         corr_id = f"contacts_test_{int(time.time())}"
         message = {"corrId": corr_id, "cmd": "/contacts"}
         
-        await mock_ws.send(json.dumps(message))
+        await mock_ws.send(_dumps(message))
         response = await mock_ws.recv()
         
-        resp_data = json.loads(response)
+        resp_data = _loads(response)
         if resp_data.get('resp', {}).get('Right', {}).get('type') == 'contactsList':
             contacts = resp_data['resp']['Right'].get('contacts', [])
             print(f"✅ /contacts works: {len(contacts)} contacts")
@@ -73,10 +73,10 @@ async def test_all_bot_commands():
         corr_id = f"groups_test_{int(time.time())}"
         message = {"corrId": corr_id, "cmd": "/groups"}
         
-        await mock_ws.send(json.dumps(message))
+        await mock_ws.send(_dumps(message))
         response = await mock_ws.recv()
         
-        resp_data = json.loads(response)
+        resp_data = _loads(response)
         if resp_data.get('resp', {}).get('Right', {}).get('type') == 'groupsList':
             groups = resp_data['resp']['Right'].get('groups', [])
             print(f"✅ /groups works: {len(groups)} groups")
@@ -5,11 +5,11 @@ Test bot commands by directly calling the WebSocket manager with mocked connecti
 
 import asyncio
 import json
-import pytest
 from unittest.mock import patch, AsyncMock
 import time
 
-@pytest.mark.asyncio
+from ws_json import dumps as _dumps, loads as _loads
+
 async def test_contacts_command_timeout():
     """Test the specific !contacts list command with mocked WebSocket"""
     
@@ -41,7 +41,7 @@ async def test_contacts_command_timeout():
         message = {"corrId": corr_id, "cmd": "/contacts"}
         
         start_time = time.time()
-        await mock_ws.send(json.dumps(message))
+        await mock_ws.send(_dumps(message))
         print(f"📤 Sent at: {start_time}")
         
         print("⏰ Waiting for mocked response...")
@@ -51,7 +51,7 @@ async def test_contacts_command_timeout():
         print(f"✅ Response received after {end_time - start_time:.2f} seconds")
         
         # Parse response
-        resp_data = json.loads(response)
+        resp_data = _loads(response)
         print(f"📥 Response correlation ID: {resp_data.get('corrId')}")
         
         if 'resp' in resp_data:
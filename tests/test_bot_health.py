@@ -14,17 +14,17 @@ from unittest.mock import patch, AsyncMock, MagicMock
 
 from config_manager import ConfigManager
 from bot import SimplexChatBot
+from yaml_io import DUMPER as _DUMPER
 
 
 class TestBotHealth:
     """Test bot health and startup behavior"""
     
-    def test_bot_initialization_no_errors(self, temp_config_dir, minimal_config):
+    def test_bot_initialization_no_errors(self, temp_config_dir, minimal_yaml):
         """Test that bot initializes without errors or warnings"""
         config_path = temp_config_dir / "health_test_config.yml"
         
-        with open(config_path, 'w') as f:
-            yaml.dump(minimal_config, f)
+        config_path.write_text(minimal_yaml)
         
         # Create bot and verify no exceptions during initialization
         bot = SimplexChatBot(config_path=str(config_path))
@@ -40,12 +40,11 @@ class TestBotHealth:
         assert bot.xftp_client is not None
         assert bot.running is False  # Should start as False
         
-    def test_bot_configuration_validation_health(self, temp_config_dir, minimal_config):
+    def test_bot_configuration_validation_health(self, temp_config_dir, minimal_yaml):
         """Test that bot configuration is validated properly"""
         config_path = temp_config_dir / "validation_health_test.yml"
         
-        with open(config_path, 'w') as f:
-            yaml.dump(minimal_config, f)
+        config_path.write_text(minimal_yaml)
         
         bot = SimplexChatBot(config_path=str(config_path))
         
@@ -53,17 +52,18 @@ class TestBotHealth:
         assert bot.config.get('name') is not None
         assert bot.config.get('websocket_url', '').startswith('ws://')
         
-    @pytest.mark.asyncio
-    async def test_bot_connection_retry_mechanism(self, temp_config_dir, minimal_config, caplog):
+    async def test_bot_connection_retry_mechanism(self, temp_config_dir, minimal_config_template, caplog):
         """Test that bot implements proper retry logic for connections"""
         config_path = temp_config_dir / "retry_test_config.yml"
         
         # Set an unreachable WebSocket URL
-        test_config = minimal_config.copy()
-        test_config['bot']['websocket_url'] = 'ws://unreachable-host:9999'
+        test_config = {
+            **minimal_config_template,
+            'bot': {**minimal_config_template['bot'], 'websocket_url': 'ws://unreachable-host:9999'}
+        }
         
         with open(config_path, 'w') as f:
-            yaml.dump(test_config, f)
+            yaml.dump(test_config, f, Dumper=_DUMPER)
         
         bot = SimplexChatBot(config_path=str(config_path))
         
@@ -77,13 +77,11 @@ class TestBotHealth:
         assert "ATTEMPT" in caplog.text
         assert "retrying in" in caplog.text
         
-    @pytest.mark.asyncio
-    async def test_bot_graceful_shutdown(self, temp_config_dir, minimal_config):
+    async def test_bot_graceful_shutdown(self, temp_config_dir, minimal_yaml):
         """Test that bot shuts down gracefully"""
         config_path = temp_config_dir / "shutdown_test_config.yml"
         
-        with open(config_path, 'w') as f:
-            yaml.dump(minimal_config, f)
+        config_path.write_text(minimal_yaml)
         
         bot = SimplexChatBot(config_path=str(config_path))
         
@@ -97,12 +95,11 @@ class TestBotHealth:
         # Verify graceful shutdown
         assert bot.running is False
         
-    def test_bot_command_registration_health(self, temp_config_dir, minimal_config):
+    def test_bot_command_registration_health(self, temp_config_dir, minimal_yaml):
         """Test that core commands are registered properly"""
         config_path = temp_config_dir / "commands_health_test.yml"
         
-        with open(config_path, 'w') as f:
-            yaml.dump(minimal_config, f)
+        config_path.write_text(minimal_yaml)
         
         bot = SimplexChatBot(config_path=str(config_path))
         
@@ -120,12 +117,11 @@ class TestBotHealth:
         assert hasattr(bot, 'plugin_manager')
         assert bot.plugin_manager is not None
         
-    def test_bot_logger_initialization_health(self, temp_config_dir, minimal_config):
+    def test_bot_logger_initialization_health(self, temp_config_dir, minimal_yaml):
         """Test that bot logging is set up correctly without errors"""
         config_path = temp_config_dir / "logger_health_test.yml"
         
-        with open(config_path, 'w') as f:
-            yaml.dump(minimal_config, f)
+        config_path.write_text(minimal_yaml)
         
         bot = SimplexChatBot(config_path=str(config_path))
         
@@ -137,13 +133,11 @@ class TestBotHealth:
         bot.logger.info("Test log message")
         bot.message_logger.info("Test message log")
         
-    @pytest.mark.asyncio
-    async def test_bot_message_handling_no_errors(self, temp_config_dir, minimal_config):
+    async def test_bot_message_handling_no_errors(self, temp_config_dir, minimal_yaml):
         """Test that bot handles messages without throwing errors"""
         config_path = temp_config_dir / "message_handling_test.yml"
         
-        with open(config_path, 'w') as f:
-            yaml.dump(minimal_config, f)
+        config_path.write_text(minimal_yaml)
         
         bot = SimplexChatBot(config_path=str(config_path))
         
@@ -217,7 +211,7 @@ class TestBotHealth:
         config_path = temp_config_dir / "env_var_health_test.yml"
         
         with open(config_path, 'w') as f:
-            yaml.dump(config_data, f)
+            yaml.dump(config_data, f, Dumper=_DUMPER)
         
         # Test with environment variables set
         with patch.dict(os.environ, {
@@ -239,12 +233,11 @@ class TestBotHealth:
             assert bot2.config.get('name') == 'Health Test Bot'
             assert bot2.config.get('websocket_url') == 'ws://localhost:3030'
 
-    def test_bot_component_integration(self, temp_config_dir, minimal_config):
+    def test_bot_component_integration(self, temp_config_dir, minimal_yaml):
         """Test that all bot components are properly integrated"""
         config_path = temp_config_dir / "integration_test.yml"
         
-        with open(config_path, 'w') as f:
-            yaml.dump(minimal_config, f)
+        config_path.write_text(minimal_yaml)
         
         bot = SimplexChatBot(config_path=str(config_path))
         
@@ -258,12 +251,11 @@ class TestBotHealth:
         assert hasattr(bot.file_download_manager, 'logger')
         assert hasattr(bot.websocket_manager, 'logger')
 
-    def test_bot_command_execution(self, temp_config_dir, minimal_config):
+    def test_bot_command_execution(self, temp_config_dir, minimal_yaml):
         """Test command execution functionality"""
         config_path = temp_config_dir / "command_test.yml"
         
-        with open(config_path, 'w') as f:
-            yaml.dump(minimal_config, f)
+        config_path.write_text(minimal_yaml)
         
         bot = SimplexChatBot(config_path=str(config_path))
         
@@ -312,13 +304,11 @@ class TestDockerHealthIntegration:
 class TestBotStabilityAndResilience:
     """Test bot stability under various conditions"""
     
-    @pytest.mark.asyncio
-    async def test_bot_handles_malformed_messages_gracefully(self, temp_config_dir, minimal_config):
+    async def test_bot_handles_malformed_messages_gracefully(self, temp_config_dir, minimal_yaml):
         """Test that bot handles malformed messages without crashing"""
         config_path = temp_config_dir / "malformed_test.yml"
         
-        with open(config_path, 'w') as f:
-            yaml.dump(minimal_config, f)
+        config_path.write_text(minimal_yaml)
         
         bot = SimplexChatBot(config_path=str(config_path))
         bot.websocket_manager.send_message = AsyncMock()
@@ -339,12 +329,11 @@ class TestBotStabilityAndResilience:
                 # Log the error but don't fail the test - bot should be resilient
                 print(f"Bot handled malformed message with error: {e}")
                 
-    def test_bot_resource_cleanup(self, temp_config_dir, minimal_config):
+    def test_bot_resource_cleanup(self, temp_config_dir, minimal_yaml):
         """Test that bot properly cleans up resources"""
         config_path = temp_config_dir / "cleanup_test.yml"
         
-        with open(config_path, 'w') as f:
-            yaml.dump(minimal_config, f)
+        config_path.write_text(minimal_yaml)
         
         # Create and initialize bot
         bot = SimplexChatBot(config_path=str(config_path))
@@ -10,72 +10,53 @@ import os
 from pathlib import Path
 from unittest.mock import patch, AsyncMock, MagicMock
 
-# Import bot class
-from bot import SimplexChatBot, DailyRotatingLogger
+# bot pulls in websockets, plugins and watchdog - tests import it where it is used
+# so collecting this module stays cheap
 
 
 class TestBotConfigurationIntegration:
     """Test bot integration with configuration system"""
     
-    def test_bot_initialization_with_config(self, temp_config_dir, minimal_config):
-        """Test bot initializes correctly with configuration file"""
-        config_path = temp_config_dir / "bot_test.yml"
-        
-        with open(config_path, 'w') as f:
-            yaml.dump(minimal_config, f)
+    def test_bot_config_fields(self, bot_from_config, minimal_config_template):
+        """Test bot configuration is applied correctly (bot.config is just the bot section)"""
+        bot = bot_from_config(minimal_config_template)
         
-        # Create plugins directory to prevent plugin system errors
-        plugins_dir = temp_config_dir / "plugins" / "external"
-        plugins_dir.mkdir(parents=True, exist_ok=True)
-        
-        original_cwd = os.getcwd()
-        os.chdir(temp_config_dir)
-        
-        try:
-            bot = SimplexChatBot(str(config_path))
-            
-            # Check bot configuration is applied correctly (bot.config is just the bot section)
-            assert bot.config.get('name') == minimal_config['bot']['name']
-            assert bot.config.get('websocket_url') == minimal_config['bot']['websocket_url']
-            assert bot.config.get('auto_accept_contacts') == minimal_config['bot']['auto_accept_contacts']
-            
-            # Check components are initialized
-            assert bot.websocket_manager is not None
-            assert bot.file_download_manager is not None
-            assert bot.message_handler is not None
-            assert bot.command_registry is not None
-            
-            # Check media configuration through file download manager
-            assert bot.file_download_manager.media_enabled == minimal_config['media']['download_enabled']
-            # Media path is resolved relative to current directory
-            expected_path = Path(minimal_config['media']['storage_path']).resolve()
-            actual_path = Path(bot.file_download_manager.media_path).resolve()
-            assert actual_path == expected_path
-            
-        finally:
-            os.chdir(original_cwd)
+        assert bot.config.get('name') == minimal_config_template['bot']['name']
+        assert bot.config.get('websocket_url') == minimal_config_template['bot']['websocket_url']
+        assert bot.config.get('auto_accept_contacts') == minimal_config_template['bot']['auto_accept_contacts']
+    
+    def test_bot_initialization_with_config(self, bot_from_stream, minimal_config_template):
+        """Test bot initializes correctly with configuration file"""
+        bot = bot_from_stream(minimal_config_template)
+        
+        # Check components are initialized
+        assert bot.websocket_manager is not None
+        assert bot.file_download_manager is not None
+        assert bot.message_handler is not None
+        assert bot.command_registry is not None
+        
+        # Check media configuration through file download manager
+        assert bot.file_download_manager.media_enabled == minimal_config_template['media']['download_enabled']
+        # Media path is resolved relative to current directory
+        expected_path = Path(minimal_config_template['media']['storage_path']).resolve()
+        actual_path = Path(bot.file_download_manager.media_path).resolve()
+        assert actual_path == expected_path
     
-    def test_bot_with_environment_variables(self, temp_config_dir, sample_config_dict, mock_env_vars):
+    def test_bot_with_environment_variables(self, temp_config_dir, monkeypatch, shared_logger,
+                                            sample_config_dict, mock_env_vars):
         """Test bot configuration with environment variable substitution"""
-        config_path = temp_config_dir / "env_bot_test.yml"
+        from bot import SimplexChatBot
         
-        with open(config_path, 'w') as f:
-            yaml.dump(sample_config_dict, f)
+        monkeypatch.chdir(temp_config_dir)
         
-        original_cwd = os.getcwd()
-        os.chdir(temp_config_dir)
+        # Substitution happens in memory, no YAML file needed
+        bot = SimplexChatBot.from_dict(sample_config_dict, logger_manager=shared_logger)
         
-        try:
-            bot = SimplexChatBot(str(config_path))
-            
-            # Check environment variables are substituted
-            assert bot.config.get('name') == 'Test Bot'  # From mock_env_vars
-            assert bot.config.get('websocket_url') == 'ws://test:3030'  # From mock_env_vars
-            
-        finally:
-            os.chdir(original_cwd)
+        # Check environment variables are substituted
+        assert bot.config.get('name') == 'Test Bot'  # From mock_env_vars
+        assert bot.config.get('websocket_url') == 'ws://test:3030'  # From mock_env_vars
     
-    def test_bot_commands_configuration(self, temp_config_dir):
+    def test_bot_commands_configuration(self, bot_from_stream):
         """Test bot command configuration"""
         config_data = {
             'servers': {'smp': ['smp://localhost:5223']},
@@ -94,84 +75,30 @@ class TestBotConfigurationIntegration:
             'xftp': {'cli_path': '/usr/local/bin/xftp', 'temp_dir': './temp/xftp', 'timeout': 300}
         }
         
-        config_path = temp_config_dir / "commands_test.yml"
-        
-        with open(config_path, 'w') as f:
-            yaml.dump(config_data, f)
+        bot = bot_from_stream(config_data)
         
-        # Create plugins directory and version.yml to prevent errors
-        plugins_dir = temp_config_dir / "plugins" / "external"
-        plugins_dir.mkdir(parents=True, exist_ok=True)
+        # Check available commands in command registry (core only)
+        available_commands = bot.command_registry.command_names()
+        assert {'help'} <= available_commands  # Core command (info was moved to help)
         
-        version_yml = temp_config_dir / "version.yml"
-        with open(version_yml, 'w') as f:
-            yaml.dump({
-                'bot': {
-                    'name': 'Test Bot',
-                    'version': '1.0.0',
-                    'description': 'Test bot for integration tests',
-                    'platform': 'SimpleX'
-                }
-            }, f)
-        
-        original_cwd = os.getcwd()
-        os.chdir(temp_config_dir)
-        
-        try:
-            bot = SimplexChatBot(str(config_path))
-            
-            # Check available commands in command registry (core only)
-            available_commands = bot.command_registry.list_commands()
-            assert 'help' in available_commands  # Core command (info was moved to help)
-            
-            # Check plugin system is initialized (commands moved to plugins)
-            assert hasattr(bot, 'plugin_manager')
-            assert bot.plugin_manager is not None
-            
-        finally:
-            os.chdir(original_cwd)
+        # Check plugin system is initialized (commands moved to plugins)
+        assert hasattr(bot, 'plugin_manager')
+        assert bot.plugin_manager is not None
     
-    def test_bot_media_directory_creation(self, temp_config_dir, minimal_config):
+    def test_bot_media_directory_creation(self, bot_from_config, minimal_config_template):
         """Test bot properly initializes file download manager with media configuration"""
-        config_path = temp_config_dir / "media_test.yml"
-        
-        with open(config_path, 'w') as f:
-            yaml.dump(minimal_config, f)
-        
-        # Create plugins directory to prevent plugin system errors
-        plugins_dir = temp_config_dir / "plugins" / "external"
-        plugins_dir.mkdir(parents=True, exist_ok=True)
+        bot = bot_from_config(minimal_config_template)
         
-        original_cwd = os.getcwd()
-        os.chdir(temp_config_dir)
-        
-        try:
-            bot = SimplexChatBot(str(config_path))
-            
-            # Check file download manager is properly initialized
-            assert bot.file_download_manager is not None
-            assert bot.file_download_manager.media_enabled == minimal_config['media']['download_enabled']
-            assert bot.file_download_manager.media_path is not None
-            assert isinstance(bot.file_download_manager.media_path, Path)
-            
-        finally:
-            os.chdir(original_cwd)
+        # Check file download manager is properly initialized
+        assert bot.file_download_manager is not None
+        assert bot.file_download_manager.media_enabled == minimal_config_template['media']['download_enabled']
+        assert bot.file_download_manager.media_path is not None
+        assert isinstance(bot.file_download_manager.media_path, Path)
     
-    def test_bot_with_invalid_config_fails(self, temp_config_dir, invalid_config):
+    def test_bot_with_invalid_config_fails(self, bot_from_config, invalid_config):
         """Test bot initialization fails with invalid configuration"""
-        config_path = temp_config_dir / "invalid_test.yml"
-        
-        with open(config_path, 'w') as f:
-            yaml.dump(invalid_config, f)
-        
-        original_cwd = os.getcwd()
-        os.chdir(temp_config_dir)
-        
-        try:
-            with pytest.raises((ValueError, KeyError, TypeError)):
-                SimplexChatBot(str(config_path))
-        finally:
-            os.chdir(original_cwd)
+        with pytest.raises((ValueError, KeyError, TypeError)):
+            bot_from_config(invalid_config)
 
 
 class TestBotLoggingIntegration:
@@ -179,6 +106,8 @@ class TestBotLoggingIntegration:
     
     def test_daily_rotating_logger_initialization(self, temp_config_dir):
         """Test DailyRotatingLogger initialization"""
+        from bot import DailyRotatingLogger
+        
         logging_config = {
             'daily_rotation': True,
             'message_log_separate': True,
@@ -202,7 +131,7 @@ class TestBotLoggingIntegration:
         finally:
             os.chdir(original_cwd)
     
-    def test_bot_logging_setup(self, temp_config_dir, minimal_config):
+    def test_bot_logging_setup(self, bot_from_stream, minimal_config):
         """Test bot logging is set up correctly"""
         # Configure logging settings
         minimal_config['logging'] = {
@@ -212,142 +141,66 @@ class TestBotLoggingIntegration:
             'log_level': 'INFO'
         }
         
-        config_path = temp_config_dir / "logging_test.yml"
-        
-        with open(config_path, 'w') as f:
-            yaml.dump(minimal_config, f)
-        
-        original_cwd = os.getcwd()
-        os.chdir(temp_config_dir)
+        bot = bot_from_stream(minimal_config, own_logger=True)
         
-        try:
-            bot = SimplexChatBot(str(config_path))
-            
-            # Check loggers are available
-            assert hasattr(bot, 'logger')
-            assert hasattr(bot, 'message_logger')
-            assert bot.logger is not None
-            assert bot.message_logger is not None
-        finally:
-            os.chdir(original_cwd)
+        # Check loggers are available
+        assert hasattr(bot, 'logger')
+        assert hasattr(bot, 'message_logger')
+        assert bot.logger is not None
+        assert bot.message_logger is not None
 
 
 class TestBotMethodIntegration:
     """Test bot methods work with configuration"""
     
-    @pytest.mark.asyncio
-    async def test_command_execution_with_config(self, temp_config_dir, minimal_config):
+    async def test_command_execution_with_config(self, bot_from_stream, minimal_config_template):
         """Test command execution works correctly"""
-        config_path = temp_config_dir / "command_test.yml"
+        bot = bot_from_stream(minimal_config_template)
         
-        with open(config_path, 'w') as f:
-            yaml.dump(minimal_config, f)
-        
-        # Create plugins directory and version.yml to prevent errors
-        plugins_dir = temp_config_dir / "plugins" / "external"
-        plugins_dir.mkdir(parents=True, exist_ok=True)
-        
-        version_yml = temp_config_dir / "version.yml"
-        with open(version_yml, 'w') as f:
-            yaml.dump({
-                'bot': {
-                    'name': 'Test Bot',
-                    'version': '1.0.0',
-                    'description': 'Test bot for integration tests',
-                    'platform': 'SimpleX'
-                }
-            }, f)
+        # Test command detection
+        assert bot.command_registry.is_command('!help') == True
+        assert bot.command_registry.is_command('hello') == False
         
-        original_cwd = os.getcwd()
-        os.chdir(temp_config_dir)
-        
-        try:
-            bot = SimplexChatBot(str(config_path))
-            
-            # Test command detection
-            assert bot.command_registry.is_command('!help') == True
-            assert bot.command_registry.is_command('hello') == False
-            
-            # Test command execution
-            result = await bot.command_registry.execute_command('!help', 'test_user')
-            assert result is not None
-            assert 'help' in result.lower()  # The help command should mention help in its output
-            
-        finally:
-            os.chdir(original_cwd)
+        # Test command execution
+        result = await bot.command_registry.execute_command('!help', 'test_user')
+        assert result is not None
+        assert 'help' in result.lower()  # The help command should mention help in its output
     
-    def test_file_type_detection_method(self, temp_config_dir, minimal_config):
+    def test_file_type_detection_method(self, bot_from_stream, minimal_config_template):
         """Test file type detection method in file download manager"""
-        config_path = temp_config_dir / "file_type_test.yml"
-        
-        with open(config_path, 'w') as f:
-            yaml.dump(minimal_config, f)
-        
-        original_cwd = os.getcwd()
-        os.chdir(temp_config_dir)
-        
-        try:
-            bot = SimplexChatBot(str(config_path))
-            
-            # Test different file types through file download manager
-            assert bot.file_download_manager._get_file_type("image.jpg") == "image"
-            assert bot.file_download_manager._get_file_type("video.mp4") == "video"
-            assert bot.file_download_manager._get_file_type("audio.mp3") == "audio"
-            assert bot.file_download_manager._get_file_type("document.pdf") == "document"
-            assert bot.file_download_manager._get_file_type("unknown.xyz") == "document"  # Default
-            
-        finally:
-            os.chdir(original_cwd)
+        bot = bot_from_stream(minimal_config_template)
+        
+        # Test different file types through file download manager
+        assert bot.file_download_manager._get_file_type("image.jpg") == "image"
+        assert bot.file_download_manager._get_file_type("video.mp4") == "video"
+        assert bot.file_download_manager._get_file_type("audio.mp3") == "audio"
+        assert bot.file_download_manager._get_file_type("document.pdf") == "document"
+        assert bot.file_download_manager._get_file_type("unknown.xyz") == "document"  # Default
     
-    @pytest.mark.asyncio
-    async def test_websocket_message_sending(self, temp_config_dir, minimal_config):
+    async def test_websocket_message_sending(self, bot_from_stream, minimal_config_template):
         """Test WebSocket message sending respects configuration"""
-        config_path = temp_config_dir / "websocket_test.yml"
+        bot = bot_from_stream(minimal_config_template)
         
-        with open(config_path, 'w') as f:
-            yaml.dump(minimal_config, f)
+        # Mock the websocket send_command method
+        bot.websocket_manager.send_command = AsyncMock()
         
-        original_cwd = os.getcwd()
-        os.chdir(temp_config_dir)
+        # Test message sending
+        await bot.websocket_manager.send_message("test_contact", "test message")
         
-        try:
-            bot = SimplexChatBot(str(config_path))
-            
-            # Mock the websocket send_command method
-            bot.websocket_manager.send_command = AsyncMock()
-            
-            # Test message sending
-            await bot.websocket_manager.send_message("test_contact", "test message")
-            
-            # Check that send_command was called
-            bot.websocket_manager.send_command.assert_called_once()
-            
-        finally:
-            os.chdir(original_cwd)
+        # Check that send_command was called
+        bot.websocket_manager.send_command.assert_called_once()
 
-    def test_component_dependency_injection(self, temp_config_dir, minimal_config):
+    def test_component_dependency_injection(self, bot_from_stream, minimal_config_template):
         """Test that components are properly dependency injected"""
-        config_path = temp_config_dir / "dependency_test.yml"
+        bot = bot_from_stream(minimal_config_template)
         
-        with open(config_path, 'w') as f:
-            yaml.dump(minimal_config, f)
+        # Test dependency injection relationships
+        assert bot.message_handler.command_registry == bot.command_registry
+        assert bot.message_handler.file_download_manager == bot.file_download_manager
+        assert bot.file_download_manager.xftp_client == bot.xftp_client
         
-        original_cwd = os.getcwd()
-        os.chdir(temp_config_dir)
-        
-        try:
-            bot = SimplexChatBot(str(config_path))
-            
-            # Test dependency injection relationships
-            assert bot.message_handler.command_registry == bot.command_registry
-            assert bot.message_handler.file_download_manager == bot.file_download_manager
-            assert bot.file_download_manager.xftp_client == bot.xftp_client
-            
-            # Test that send_message_callback is properly injected
-            assert bot.message_handler.send_message_callback == bot.websocket_manager.send_message
-            
-        finally:
-            os.chdir(original_cwd)
+        # Test that send_message_callback is properly injected
+        assert bot.message_handler.send_message_callback == bot.websocket_manager.send_message
 
 
 class TestConfigurationErrors:
@@ -355,6 +208,8 @@ class TestConfigurationErrors:
     
     def test_config_manager_initialization_error_propagates(self, temp_config_dir):
         """Test that ConfigManager errors propagate to bot initialization"""
+        from bot import SimplexChatBot
+        
         # Create a file that's not valid YAML
         config_path = temp_config_dir / "invalid_yaml.yml"
         with open(config_path, 'w') as f:
@@ -369,7 +224,7 @@ class TestConfigurationErrors:
         finally:
             os.chdir(original_cwd)
     
-    def test_bot_handles_missing_optional_config_sections(self, temp_config_dir):
+    def test_bot_handles_missing_optional_config_sections(self, bot_from_config):
         """Test bot handles missing optional configuration gracefully"""
         # Minimal config with only required sections
         minimal_required = {
@@ -382,30 +237,14 @@ class TestConfigurationErrors:
             'xftp': {'cli_path': '/usr/local/bin/xftp', 'temp_dir': './temp/xftp', 'timeout': 300}
         }
         
-        config_path = temp_config_dir / "minimal_required.yml"
-        
-        with open(config_path, 'w') as f:
-            yaml.dump(minimal_required, f)
-        
-        # Create plugins directory to prevent plugin system errors
-        plugins_dir = temp_config_dir / "plugins" / "external"
-        plugins_dir.mkdir(parents=True, exist_ok=True)
-        
-        original_cwd = os.getcwd()
-        os.chdir(temp_config_dir)
+        # Should initialize successfully with defaults for missing keys
+        bot = bot_from_config(minimal_required)
         
-        try:
-            # Should initialize successfully with defaults for missing keys
-            bot = SimplexChatBot(str(config_path))
-            
-            # Check defaults are applied - auto_accept_contacts should default if not specified
-            # The exact default depends on the configuration loading logic
-            assert bot.config.get('auto_accept_contacts') is not None
-            
-        finally:
-            os.chdir(original_cwd)
+        # Check defaults are applied - auto_accept_contacts should default if not specified
+        # The exact default depends on the configuration loading logic
+        assert bot.config.get('auto_accept_contacts') is not None
 
-    def test_component_initialization_with_minimal_config(self, temp_config_dir):
+    def test_component_initialization_with_minimal_config(self, bot_from_stream):
         """Test all components initialize correctly with minimal configuration"""
         minimal_config = {
             'servers': {'smp': ['smp://localhost:5223'], 'xftp': ['xftp://localhost:443']},
@@ -422,30 +261,18 @@ class TestConfigurationErrors:
             'xftp': {'cli_path': '/usr/local/bin/xftp', 'temp_dir': './temp/xftp', 'timeout': 300, 'max_file_size': 1073741824, 'retry_attempts': 3, 'cleanup_on_failure': True}
         }
         
-        config_path = temp_config_dir / "component_init_test.yml"
-        
-        with open(config_path, 'w') as f:
-            yaml.dump(minimal_config, f)
-        
-        original_cwd = os.getcwd()
-        os.chdir(temp_config_dir)
-        
-        try:
-            bot = SimplexChatBot(str(config_path))
-            
-            # Verify all components are properly initialized
-            assert bot.websocket_manager is not None
-            assert bot.file_download_manager is not None
-            assert bot.message_handler is not None
-            assert bot.command_registry is not None
-            assert bot.xftp_client is not None
-            
-            # Verify component types
-            assert hasattr(bot.websocket_manager, 'websocket_url')
-            assert hasattr(bot.file_download_manager, 'media_enabled')
-            assert hasattr(bot.message_handler, 'command_registry')
-            assert hasattr(bot.command_registry, 'commands')
-            assert hasattr(bot.xftp_client, 'cli_path')
-            
-        finally:
-            os.chdir(original_cwd)
\ No newline at end of file
+        bot = bot_from_stream(minimal_config)
+        
+        # Verify all components are properly initialized
+        assert bot.websocket_manager is not None
+        assert bot.file_download_manager is not None
+        assert bot.message_handler is not None
+        assert bot.command_registry is not None
+        assert bot.xftp_client is not None
+        
+        # Verify component types
+        assert hasattr(bot.websocket_manager, 'websocket_url')
+        assert hasattr(bot.file_download_manager, 'media_enabled')
+        assert hasattr(bot.message_handler, 'command_registry')
+        assert hasattr(bot.command_registry, 'commands')
+        assert hasattr(bot.xftp_client, 'cli_path')
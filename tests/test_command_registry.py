@@ -4,164 +4,204 @@ Tests for CommandRegistry component
 
 import pytest
 import asyncio
-import logging
 from unittest.mock import AsyncMock
 
-from bot import CommandRegistry
+
+# is_command edge cases: (text, expected)
+CMD_PARSE_CASES = [
+    ('!help', True),
+    ('!HELP', True),        # Valid command format
+    ('!!help', True),       # Double exclamation - treated as valid (!help after first !)
+    ('!help!', True),       # Should still detect help
+    ('!help_test', True),   # Valid command format
+    ('!help-test', True),   # Valid command format  
+    ('!help123', True),     # Valid command format
+    ('!help ', True),       # Trailing space
+    (' !help', True),       # Leading space
+    ('!help\n', True),      # Newline
+    ('!help\t', True),      # Tab
+    ('!status', True),      # Valid command format (plugin will handle)
+    ('!ping', True),        # Valid command format (plugin will handle)
+    ('!stats', True),       # Valid command format (plugin will handle)
+    ('!plugins', True),     # Valid command format (plugin will handle)
+]
 
 
 class TestCommandRegistry:
     """Test CommandRegistry functionality"""
     
-    def setup_method(self):
-        """Setup test dependencies"""
-        self.logger = logging.getLogger('test')
-        from admin_manager import AdminManager
-        self.admin_manager = AdminManager(logger=self.logger)
-        self.command_registry = CommandRegistry(self.logger, self.admin_manager)
-    
-    def test_command_registry_initialization(self):
+    def test_command_registry_initialization(self, command_registry, silent_logger):
         """Test CommandRegistry initialization"""
-        assert self.command_registry.logger == self.logger
-        assert len(self.command_registry.commands) > 0
+        assert command_registry.logger is silent_logger
+        assert len(command_registry.commands) > 0
         
         # Check that only core command is registered (others moved to plugins)
         core_commands = ['help']
         for cmd in core_commands:
-            assert cmd in self.command_registry.commands
-            assert callable(self.command_registry.commands[cmd])
+            assert cmd in command_registry.commands
+            assert callable(command_registry.commands[cmd])
     
-    def test_register_command(self):
+    def test_register_command(self, command_registry):
         """Test command registration"""
         async def test_command(args, contact_name, send_callback):
             await send_callback(contact_name, "Test response")
         
-        self.command_registry.register_command('test', test_command)
+        command_registry.register_command('test', test_command)
         
-        assert 'test' in self.command_registry.commands
-        assert self.command_registry.commands['test'] == test_command
+        assert 'test' in command_registry.commands
+        assert command_registry.commands['test'] == test_command
     
-    def test_get_command(self):
+    def test_get_command(self, command_registry):
         """Test command retrieval"""
         # Get existing command
-        help_command = self.command_registry.get_command('help')
+        help_command = command_registry.get_command('help')
         assert callable(help_command)
         
         # Get non-existent command
-        assert self.command_registry.get_command('nonexistent') is None
+        assert command_registry.get_command('nonexistent') is None
     
-    def test_list_commands(self):
+    def test_list_commands(self, command_registry):
         """Test command listing"""
-        commands = self.command_registry.list_commands()
+        commands = command_registry.list_commands()
         
         assert isinstance(commands, list)
         assert len(commands) > 0
         assert 'help' in commands
     
-    def test_is_command(self):
+    def test_command_names(self, command_registry):
+        """Test cached command name set tracks registrations"""
+        names = command_registry.command_names()
+        
+        assert isinstance(names, frozenset)
+        assert 'help' in names
+        assert command_registry.command_names() is names  # Cached
+        
+        async def test_command(args, contact_name, send_callback):
+            pass
+        
+        command_registry.register_command('test', test_command)
+        
+        assert 'test' in command_registry.command_names()
+    
+    def test_is_command(self, command_registry):
         """Test command detection"""
         # Valid commands - is_command now accepts any ! command and checks plugins later
-        assert self.command_registry.is_command('!help') == True  # Core command
-        assert self.command_registry.is_command('!status') == True  # Plugin commands also accepted
-        assert self.command_registry.is_command('!ping') == True
-        assert self.command_registry.is_command('!stats') == True
-        assert self.command_registry.is_command('!plugins') == True
+        assert command_registry.is_command('!help') == True  # Core command
+        assert command_registry.is_command('!status') == True  # Plugin commands also accepted
+        assert command_registry.is_command('!ping') == True
+        assert command_registry.is_command('!stats') == True
+        assert command_registry.is_command('!plugins') == True
         
         # Invalid commands
-        assert self.command_registry.is_command('!nonexistent') == True  # Still valid format
-        assert self.command_registry.is_command('help') == False  # Missing !
-        assert self.command_registry.is_command('hello world') == False
-        assert self.command_registry.is_command('') == False
-        assert self.command_registry.is_command('!') == False  # Empty command
+        assert command_registry.is_command('!nonexistent') == True  # Still valid format
+        assert command_registry.is_command('help') == False  # Missing !
+        assert command_registry.is_command('hello world') == False
+        assert command_registry.is_command('') == False
+        assert command_registry.is_command('!') == False  # Empty command
         
         # Edge cases
-        assert self.command_registry.is_command('!help extra args') == True  # Should still detect help
-        assert self.command_registry.is_command('  !help  ') == True  # Should handle whitespace
+        assert command_registry.is_command('!help extra args') == True  # Should still detect help
+        assert command_registry.is_command('  !help  ') == True  # Should handle whitespace
     
-    @pytest.mark.asyncio
-    async def test_execute_command_help(self):
+    async def test_execute_command_help(self, command_registry):
         """Test help command execution"""
-        result = await self.command_registry.execute_command('!help', 'TestUser')
+        result = await command_registry.execute_command('!help', 'TestUser')
         
         assert result is not None
         assert isinstance(result, str)
         assert 'help' in result.lower() or 'bot' in result.lower()
     
-    @pytest.mark.asyncio
-    async def test_execute_command_moved_to_plugin(self):
+    async def test_help_text_lists_newly_registered_commands(self, command_registry):
+        """Test help text picks up a command registered after an earlier !help"""
+        replies = []
+
+        async def capture_callback(contact, message):
+            replies.append(message)
+
+        help_handler = command_registry.get_command('help')
+        await help_handler([], 'TestUser', capture_callback)
+        assert '`!custom`' not in replies[0]
+
+        command_registry.register_command('custom', help_handler)
+        await help_handler([], 'TestUser', capture_callback)
+        assert '`!custom`' in replies[1]
+
+    async def test_execute_command_moved_to_plugin(self, command_registry):
         """Test that commands moved to plugins return unknown command when no plugin manager"""
         # These commands were moved to plugins and should return unknown when no plugin manager
         for cmd in ['!status', '!ping', '!stats', '!plugins']:
-            result = await self.command_registry.execute_command(cmd, 'TestUser')
+            result = await command_registry.execute_command(cmd, 'TestUser')
             assert result is not None
             assert isinstance(result, str)
             assert 'Unknown command' in result  # Capital U in actual implementation
     
     
     
-    @pytest.mark.asyncio
-    async def test_execute_command_with_args(self):
+    async def test_execute_command_with_args(self, command_registry):
         """Test command execution with arguments"""
-        result = await self.command_registry.execute_command('!help extra args', 'TestUser')
+        result = await command_registry.execute_command('!help extra args', 'TestUser')
         
         assert result is not None
         assert isinstance(result, str)
         # Should still execute help command even with extra args
         assert 'help' in result.lower() or 'bot' in result.lower()
+
+    async def test_execute_command_leading_whitespace(self, command_registry):
+        """Test execution parses the command name the same way is_command detects it"""
+        result = await command_registry.execute_command('  !help', 'TestUser')
+
+        assert result is not None
+        assert 'Unknown command' not in result
     
-    @pytest.mark.asyncio
-    async def test_execute_command_nonexistent(self):
+    async def test_execute_command_nonexistent(self, command_registry):
         """Test execution of non-existent command"""
-        result = await self.command_registry.execute_command('!nonexistent', 'TestUser')
+        result = await command_registry.execute_command('!nonexistent', 'TestUser')
         
         assert result is not None
         assert isinstance(result, str)
         assert 'Unknown command' in result  # Capital U in actual implementation
         assert 'nonexistent' in result
     
-    @pytest.mark.asyncio
-    async def test_execute_command_invalid_format(self):
+    async def test_execute_command_invalid_format(self, command_registry):
         """Test execution of invalid command format"""
         # Not a command (missing !)
-        result = await self.command_registry.execute_command('help', 'TestUser')
+        result = await command_registry.execute_command('help', 'TestUser')
         assert result is None
         
         # Empty command
-        result = await self.command_registry.execute_command('', 'TestUser')
+        result = await command_registry.execute_command('', 'TestUser')
         assert result is None
         
         # Just exclamation mark
-        result = await self.command_registry.execute_command('!', 'TestUser')
+        result = await command_registry.execute_command('!', 'TestUser')
         assert result is None  # is_command returns False for just '!'
     
-    @pytest.mark.asyncio
-    async def test_custom_command_registration_and_execution(self):
+    async def test_custom_command_registration_and_execution(self, command_registry):
         """Test registering and executing custom commands"""
         # Register a custom command
         async def custom_command(args, contact_name, send_callback):
             response = f"Hello {contact_name}! Args: {', '.join(args) if args else 'none'}"
             await send_callback(contact_name, response)
         
-        self.command_registry.register_command('custom', custom_command)
+        command_registry.register_command('custom', custom_command)
         
         # Test execution
-        result = await self.command_registry.execute_command('!custom arg1 arg2', 'TestUser')
+        result = await command_registry.execute_command('!custom arg1 arg2', 'TestUser')
         
         assert result is not None
         assert 'Hello TestUser!' in result
         assert 'arg1, arg2' in result
     
-    @pytest.mark.asyncio
-    async def test_command_error_handling(self):
+    async def test_command_error_handling(self, command_registry):
         """Test command error handling"""
         # Register a command that raises an exception
         async def error_command(args, contact_name, send_callback):
             raise Exception("Command error")
         
-        self.command_registry.register_command('error', error_command)
+        command_registry.register_command('error', error_command)
         
         # Test execution - should handle error gracefully
-        result = await self.command_registry.execute_command('!error', 'TestUser')
+        result = await command_registry.execute_command('!error', 'TestUser')
         
         assert result is not None
         assert 'Error executing command' in result
@@ -171,14 +211,8 @@ class TestCommandRegistry:
 class TestCommandRegistryIntegration:
     """Test CommandRegistry integration scenarios"""
     
-    @pytest.mark.asyncio
-    async def test_command_registry_with_real_callbacks(self):
+    async def test_command_registry_with_real_callbacks(self, command_registry):
         """Test CommandRegistry with actual callback functions"""
-        logger = logging.getLogger('test')
-        from admin_manager import AdminManager
-        admin_manager = AdminManager(logger=logger)
-        command_registry = CommandRegistry(logger, admin_manager)
-        
         # Track callback calls
         callback_calls = []
         
@@ -194,32 +228,8 @@ class TestCommandRegistryIntegration:
         assert callback_calls[0][0] == 'TestUser'
         assert len(callback_calls[0][1]) > 0  # Should return some help
     
-    def test_command_parsing_edge_cases(self):
+    @pytest.mark.parametrize("command_text,expected", CMD_PARSE_CASES)
+    def test_command_parsing_edge_cases(self, command_registry, command_text, expected):
         """Test command parsing edge cases"""
-        logger = logging.getLogger('test')
-        from admin_manager import AdminManager
-        admin_manager = AdminManager(logger=logger)
-        command_registry = CommandRegistry(logger, admin_manager)
-        
-        # Test various command formats
-        test_cases = [
-            ('!help', True),
-            ('!HELP', True),        # Valid command format
-            ('!!help', True),       # Double exclamation - treated as valid (!help after first !)
-            ('!help!', True),       # Should still detect help
-            ('!help_test', True),   # Valid command format
-            ('!help-test', True),   # Valid command format  
-            ('!help123', True),     # Valid command format
-            ('!help ', True),       # Trailing space
-            (' !help', True),       # Leading space
-            ('!help\n', True),      # Newline
-            ('!help\t', True),      # Tab
-            ('!status', True),      # Valid command format (plugin will handle)
-            ('!ping', True),        # Valid command format (plugin will handle)
-            ('!stats', True),       # Valid command format (plugin will handle)
-            ('!plugins', True),     # Valid command format (plugin will handle)
-        ]
-        
-        for command_text, expected in test_cases:
-            result = command_registry.is_command(command_text)
-            assert result == expected, f"Failed for '{command_text}': expected {expected}, got {result}"
\ No newline at end of file
+        result = command_registry.is_command(command_text)
+        assert result == expected, f"Failed for '{command_text}': expected {expected}, got {result}"
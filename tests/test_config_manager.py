@@ -9,7 +9,49 @@ import tempfile
 from pathlib import Path
 from unittest.mock import patch, mock_open
 
-from config_manager import ConfigManager, parse_file_size
+from config_manager import ConfigManager, _parse_yaml_cached, parse_file_size
+from yaml_io import DUMPER as _DUMPER
+
+
+def _dump(data, path):
+    """Write data as YAML to path using libyaml's emitter when available"""
+    with open(path, 'w') as f:
+        yaml.dump(data, f, Dumper=_DUMPER)
+
+
+def _set_env(values):
+    """Set environment variables for the fixture's lifetime, then restore what was there before"""
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    yield values
+    for key, value in previous.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+
+
+@pytest.fixture(scope="module")
+def bool_env():
+    """Boolean-like environment values, set once for the whole module"""
+    yield from _set_env({
+        'TRUE_VAR': 'true',
+        'FALSE_VAR': 'false',
+        'YES_VAR': 'yes',
+        'NO_VAR': 'no',
+        'ONE_VAR': '1',
+        'ZERO_VAR': '0'
+    })
+
+
+@pytest.fixture(scope="module")
+def url_env():
+    """URL component environment values, set once for the whole module"""
+    yield from _set_env({
+        'HOST': 'example.com',
+        'PORT': '8080',
+        'PROTOCOL': 'https'
+    })
 
 
 class TestConfigManagerBasics:
@@ -17,20 +59,14 @@ class TestConfigManagerBasics:
     
     def test_config_manager_initialization(self, temp_config_dir, config_file, env_file, mock_env_vars):
         """Test ConfigManager initializes correctly with valid files"""
-        # Change to temp directory to test relative paths
-        original_cwd = os.getcwd()
-        os.chdir(temp_config_dir)
-        
-        try:
-            config_manager = ConfigManager(str(config_file), str(env_file))
-            
-            assert config_manager.config_path == str(config_file)
-            assert config_manager.env_file == str(env_file)
-            assert isinstance(config_manager.config, dict)
-            assert 'servers' in config_manager.config
-            assert 'bot' in config_manager.config
-        finally:
-            os.chdir(original_cwd)
+        # Relative paths resolve against base_dir rather than the working directory
+        config_manager = ConfigManager(config_file.name, env_file.name, base_dir=str(temp_config_dir))
+        
+        assert config_manager.config_path == str(config_file)
+        assert config_manager.env_file == str(env_file)
+        assert isinstance(config_manager.config, dict)
+        assert 'servers' in config_manager.config
+        assert 'bot' in config_manager.config
     
     def test_config_manager_missing_files(self, temp_config_dir):
         """Test ConfigManager behavior with missing configuration files"""
@@ -47,34 +83,123 @@ class TestConfigManagerBasics:
     
     def test_get_method_dot_notation(self, temp_config_dir, config_file, env_file, mock_env_vars):
         """Test ConfigManager.get() method with dot notation"""
-        original_cwd = os.getcwd()
-        os.chdir(temp_config_dir)
-        
-        try:
-            config_manager = ConfigManager(str(config_file), str(env_file))
-            
-            # Test getting nested values
-            assert config_manager.get('bot.name') == 'Test Bot'
-            assert config_manager.get('servers.smp') == ['smp://test-server1.com', 'smp://test-server2.com']
-            
-            # Test getting non-existent key with default
-            assert config_manager.get('nonexistent.key', 'default') == 'default'
-            
-            # Test getting non-existent key without default
-            assert config_manager.get('nonexistent.key') is None
-        finally:
-            os.chdir(original_cwd)
+        config_manager = ConfigManager(str(config_file), str(env_file), base_dir=str(temp_config_dir))
+        
+        # Test getting nested values
+        assert config_manager.get('bot.name') == 'Test Bot'
+        assert config_manager.get('servers.smp') == ['smp://test-server1.com', 'smp://test-server2.com']
+        
+        # Test getting non-existent key with default
+        assert config_manager.get('nonexistent.key', 'default') == 'default'
+        
+        # Test getting non-existent key without default
+        assert config_manager.get('nonexistent.key') is None
+
+    def test_get_misses_honor_default(self, temp_config_dir, minimal_config_template):
+        """Test repeated lookups return each caller's default for missing keys"""
+        config_manager = ConfigManager.from_dict(minimal_config_template, str(temp_config_dir / "nonexistent.env"))
+
+        assert config_manager.get('bot.name') == config_manager.get('bot.name') == 'Test Bot'
+        assert config_manager.get('bot.missing', 'first') == 'first'
+        assert config_manager.get('bot.missing', 'second') == 'second'
+        assert config_manager.get('bot.missing') is None
+
+    def test_get_sees_in_place_edits(self, temp_config_dir, minimal_config_template):
+        """Test get() reads the live config, so edits after earlier lookups are visible"""
+        config_manager = ConfigManager.from_dict(minimal_config_template, str(temp_config_dir / "nonexistent.env"))
+        assert config_manager.get('bot.websocket_url') == 'ws://localhost:3030'
+
+        config_manager.config['bot']['websocket_url'] = 'ws://new'
+
+        assert config_manager.get('bot.websocket_url') == 'ws://new'
+
+    def test_from_dict(self, temp_config_dir, sample_config_dict, mock_env_vars):
+        """Test ConfigManager.from_dict() substitutes and validates without a config file"""
+        config_manager = ConfigManager.from_dict(sample_config_dict, str(temp_config_dir / "nonexistent.env"))
+
+        assert config_manager.config_path is None
+        assert config_manager.get('bot.name') == 'Test Bot'
+        assert config_manager.get('bot.websocket_url') == 'ws://test:3030'
+        # Source dictionary keeps its placeholders
+        assert sample_config_dict['bot']['name'].startswith('${')
+
+    def test_from_dict_reload_keeps_config(self, temp_config_dir, minimal_config_template):
+        """Test reload() on a manager without a config file leaves the configuration alone"""
+        config_manager = ConfigManager.from_dict(minimal_config_template, str(temp_config_dir / "nonexistent.env"))
+        config = config_manager.config
+
+        config_manager.reload()
+
+        assert config_manager.config is config
+
+    def test_from_stream(self, temp_config_dir, minimal_yaml):
+        """Test ConfigManager.from_stream() parses YAML from a file-like object"""
+        import io
+
+        config_manager = ConfigManager.from_stream(io.StringIO(minimal_yaml), str(temp_config_dir / "nonexistent.env"))
+
+        assert config_manager.get('bot.websocket_url') == 'ws://localhost:3030'
+        assert config_manager.get('servers.smp') == ['smp://localhost:5223']
+
+    def test_from_string(self, temp_config_dir, minimal_yaml):
+        """Test ConfigManager.from_string() parses YAML text without a config file"""
+        config_manager = ConfigManager.from_string(minimal_yaml, str(temp_config_dir / "nonexistent.env"))
+
+        assert config_manager.config_path is None
+        assert config_manager.get('bot.websocket_url') == 'ws://localhost:3030'
+
+    def test_parse_cache_picks_up_file_changes(self, temp_config_dir, minimal_config, minimal_yaml):
+        """Test cached YAML parsing is invalidated when the file changes"""
+        config_path = temp_config_dir / "cached_config.yml"
+        env_path = str(temp_config_dir / "nonexistent.env")
+
+        config_path.write_text(minimal_yaml)
+        assert ConfigManager(str(config_path), env_path).get('bot.name') == 'Test Bot'
+
+        minimal_config['bot']['name'] = 'Renamed Test Bot'
+        _dump(minimal_config, config_path)
+        assert ConfigManager(str(config_path), env_path).get('bot.name') == 'Renamed Test Bot'
+
+    def test_parse_cache_shared_by_identical_files(self, temp_config_dir, minimal_config):
+        """Test identical YAML content at different paths is parsed only once"""
+        env_path = str(temp_config_dir / "nonexistent.env")
+        minimal_config['bot']['name'] = 'Shared Parse Bot'
+        first_path = temp_config_dir / "first.yml"
+        second_path = temp_config_dir / "second.yml"
+        _dump(minimal_config, first_path)
+        _dump(minimal_config, second_path)
+
+        ConfigManager(str(first_path), env_path)
+        hits = _parse_yaml_cached.cache_info().hits
+        config_manager = ConfigManager(str(second_path), env_path)
+
+        assert _parse_yaml_cached.cache_info().hits == hits + 1
+        assert config_manager.get('bot.name') == 'Shared Parse Bot'
+
+    def test_identical_files_do_not_share_config(self, temp_config_dir, minimal_config):
+        """Test managers whose files share a parse-cache entry each get their own config"""
+        env_path = str(temp_config_dir / "nonexistent.env")
+        first_path = temp_config_dir / "first_plain.yml"
+        second_path = temp_config_dir / "second_plain.yml"
+        _dump(minimal_config, first_path)
+        _dump(minimal_config, second_path)
+
+        first = ConfigManager(str(first_path), env_path)
+        second = ConfigManager(str(second_path), env_path)
+        first.config['bot']['name'] = 'Mutated Bot'
+
+        assert second.get('bot.name') == 'Test Bot'
+        assert ConfigManager(str(first_path), env_path).get('bot.name') == 'Test Bot'
 
 
 class TestYAMLParsing:
     """Test YAML parsing functionality"""
     
-    def test_valid_yaml_parsing(self, temp_config_dir, sample_config_dict):
+    def test_valid_yaml_parsing(self, temp_config_dir, sample_config_yaml):
         """Test parsing of valid YAML configuration"""
         config_path = temp_config_dir / "test_config.yml"
         
-        with open(config_path, 'w') as f:
-            yaml.dump(sample_config_dict, f)
+        config_path.write_text(sample_config_yaml)
         
         config_manager = ConfigManager(str(config_path), "nonexistent.env")
         
@@ -97,10 +222,21 @@ class TestYAMLParsing:
         with pytest.raises(yaml.YAMLError):
             ConfigManager(str(config_path), "nonexistent.env")
     
-    def test_yaml_with_different_data_types(self, temp_config_dir, minimal_config):
+    def test_json_and_flow_mapping_configs(self, minimal_config_template):
+        """Test JSON documents and YAML flow mappings both load through the YAML parser"""
+        import json
+
+        for config_text in (
+            json.dumps(minimal_config_template),
+            yaml.dump(minimal_config_template, default_flow_style=True)  # Unquoted keys - not JSON
+        ):
+            config_manager = ConfigManager.from_string(config_text, "nonexistent.env")
+            assert config_manager.get('bot.websocket_url') == 'ws://localhost:3030'
+    
+    def test_yaml_with_different_data_types(self, minimal_config_template):
         """Test YAML parsing with different data types"""
-        config_data = minimal_config.copy()
-        config_data.update({
+        config_data = {
+            **minimal_config_template,
             'string_value': 'test',
             'int_value': 42,
             'float_value': 3.14,
@@ -108,13 +244,9 @@ class TestYAMLParsing:
             'list_value': ['item1', 'item2'],
             'dict_value': {'nested': 'value'},
             'null_value': None
-        })
+        }
         
-        config_path = temp_config_dir / "types_test.yml"
-        with open(config_path, 'w') as f:
-            yaml.dump(config_data, f)
-        
-        config_manager = ConfigManager(str(config_path), "nonexistent.env")
+        config_manager = ConfigManager.from_string(yaml.dump(config_data, Dumper=_DUMPER), "nonexistent.env")
         
         assert config_manager.get('string_value') == 'test'
         assert config_manager.get('int_value') == 42
@@ -128,182 +260,135 @@ class TestYAMLParsing:
 class TestEnvironmentVariableSubstitution:
     """Test environment variable substitution functionality"""
     
-    def test_simple_env_var_substitution(self, temp_config_dir, minimal_config, mock_env_vars):
+    def test_simple_env_var_substitution(self, minimal_config_template, mock_env_vars):
         """Test basic environment variable substitution"""
-        config_data = minimal_config.copy()
-        config_data.update({
+        config_data = {
+            **minimal_config_template,
             'test_value': '${SMP_SERVER_1}',
             'nested': {
                 'value': '${BOT_NAME}'
             }
-        })
-        
-        config_path = temp_config_dir / "env_test.yml"
-        with open(config_path, 'w') as f:
-            yaml.dump(config_data, f)
+        }
         
-        config_manager = ConfigManager(str(config_path), "nonexistent.env")
+        config_manager = ConfigManager.from_string(yaml.dump(config_data, Dumper=_DUMPER), "nonexistent.env")
         
         assert config_manager.get('test_value') == 'smp://test-server1.com'
         assert config_manager.get('nested.value') == 'Test Bot'
     
-    def test_env_var_with_default_values(self, temp_config_dir, minimal_config, clear_env_vars):
+    def test_env_var_with_default_values(self, minimal_config_template, clear_env_vars):
         """Test environment variable substitution with default values"""
-        config_data = minimal_config.copy()
-        config_data.update({
+        config_data = {
+            **minimal_config_template,
             'with_default': '${NONEXISTENT_VAR:-default_value}',
             'without_default': '${ANOTHER_NONEXISTENT_VAR}',
             'empty_default': '${EMPTY_VAR:-}',
             'complex_default': '${MISSING:-http://localhost:3030}'
-        })
+        }
         
-        config_path = temp_config_dir / "defaults_test.yml"
-        with open(config_path, 'w') as f:
-            yaml.dump(config_data, f)
-        
-        config_manager = ConfigManager(str(config_path), "nonexistent.env")
+        config_manager = ConfigManager.from_string(yaml.dump(config_data, Dumper=_DUMPER), "nonexistent.env")
         
         assert config_manager.get('with_default') == 'default_value'
         assert config_manager.get('without_default') == '${ANOTHER_NONEXISTENT_VAR}'  # Should remain unchanged
         assert config_manager.get('empty_default') == ''
         assert config_manager.get('complex_default') == 'http://localhost:3030'
     
-    def test_env_var_in_lists(self, temp_config_dir, minimal_config, mock_env_vars):
+    def test_env_var_in_lists(self, minimal_config_template, mock_env_vars):
         """Test environment variable substitution in lists"""
-        config_data = minimal_config.copy()
-        config_data.update({
+        config_data = {
+            **minimal_config_template,
             'test_servers': ['${SMP_SERVER_1}', '${SMP_SERVER_2}', 'static://server.com']
-        })
+        }
         
-        config_path = temp_config_dir / "list_test.yml"
-        with open(config_path, 'w') as f:
-            yaml.dump(config_data, f)
-        
-        config_manager = ConfigManager(str(config_path), "nonexistent.env")
+        config_manager = ConfigManager.from_string(yaml.dump(config_data, Dumper=_DUMPER), "nonexistent.env")
         
         expected = ['smp://test-server1.com', 'smp://test-server2.com', 'static://server.com']
         assert config_manager.get('test_servers') == expected
     
-    def test_boolean_env_var_substitution(self, temp_config_dir, minimal_config):
+    def test_boolean_env_var_substitution(self, minimal_config_template, bool_env):
         """Test boolean environment variable substitution"""
-        with patch.dict(os.environ, {
-            'TRUE_VAR': 'true',
-            'FALSE_VAR': 'false',
-            'YES_VAR': 'yes',
-            'NO_VAR': 'no',
-            'ONE_VAR': '1',
-            'ZERO_VAR': '0'
-        }, clear=False):
-            config_data = minimal_config.copy()
-            config_data.update({
-                'bool_true': '${TRUE_VAR:-false}',
-                'bool_false': '${FALSE_VAR:-true}',
-                'bool_yes': '${YES_VAR:-no}',
-                'bool_no': '${NO_VAR:-yes}',
-                'bool_one': '${ONE_VAR:-0}',
-                'bool_zero': '${ZERO_VAR:-1}'
-            })
-            
-            config_path = temp_config_dir / "bool_test.yml"
-            with open(config_path, 'w') as f:
-                yaml.dump(config_data, f)
-            
-            config_manager = ConfigManager(str(config_path), "nonexistent.env")
-            
-            # All should be strings after substitution
-            assert config_manager.get('bool_true') == 'true'
-            assert config_manager.get('bool_false') == 'false'
-            assert config_manager.get('bool_yes') == 'yes'
-            assert config_manager.get('bool_no') == 'no'
-            assert config_manager.get('bool_one') == '1'
-            assert config_manager.get('bool_zero') == '0'
+        config_data = {
+            **minimal_config_template,
+            'bool_true': '${TRUE_VAR:-false}',
+            'bool_false': '${FALSE_VAR:-true}',
+            'bool_yes': '${YES_VAR:-no}',
+            'bool_no': '${NO_VAR:-yes}',
+            'bool_one': '${ONE_VAR:-0}',
+            'bool_zero': '${ZERO_VAR:-1}'
+        }
+        
+        config_manager = ConfigManager.from_string(yaml.dump(config_data, Dumper=_DUMPER), "nonexistent.env")
+        
+        # All should be strings after substitution
+        assert config_manager.get('bool_true') == 'true'
+        assert config_manager.get('bool_false') == 'false'
+        assert config_manager.get('bool_yes') == 'yes'
+        assert config_manager.get('bool_no') == 'no'
+        assert config_manager.get('bool_one') == '1'
+        assert config_manager.get('bool_zero') == '0'
     
-    def test_multiple_env_vars_in_single_value(self, temp_config_dir, minimal_config):
+    def test_multiple_env_vars_in_single_value(self, minimal_config_template, url_env):
         """Test multiple environment variables in a single configuration value"""
-        with patch.dict(os.environ, {
-            'HOST': 'example.com',
-            'PORT': '8080',
-            'PROTOCOL': 'https'
-        }, clear=False):
-            config_data = minimal_config.copy()
-            config_data.update({
-                'url': '${PROTOCOL:-http}://${HOST:-localhost}:${PORT:-80}/api'
-            })
-            
-            config_path = temp_config_dir / "multi_env_test.yml"
-            with open(config_path, 'w') as f:
-                yaml.dump(config_data, f)
-            
-            config_manager = ConfigManager(str(config_path), "nonexistent.env")
-            
-            assert config_manager.get('url') == 'https://example.com:8080/api'
+        config_data = {
+            **minimal_config_template,
+            'url': '${PROTOCOL:-http}://${HOST:-localhost}:${PORT:-80}/api'
+        }
+        
+        config_manager = ConfigManager.from_string(yaml.dump(config_data, Dumper=_DUMPER), "nonexistent.env")
+        
+        assert config_manager.get('url') == 'https://example.com:8080/api'
+
+    def test_repeated_placeholder_resolved_once(self, minimal_config_template, url_env):
+        """Test a placeholder used in several values reads the environment once per load"""
+        config_data = {
+            **minimal_config_template,
+            'primary': '${HOST}',
+            'mirrors': ['${HOST}', 'backup.${HOST}']
+        }
+
+        with patch('config_manager.os.getenv', wraps=os.getenv) as getenv:
+            config_manager = ConfigManager.from_dict(config_data, "nonexistent.env")
+
+        assert [c.args[0] for c in getenv.call_args_list].count('HOST') == 1
+        assert config_manager.get('mirrors') == ['example.com', 'backup.example.com']
 
 
 class TestConfigurationGetters:
     """Test configuration getter methods"""
     
-    def test_get_servers(self, temp_config_dir, config_file, env_file, mock_env_vars):
+    def test_get_servers(self, sample_config_manager):
         """Test get_servers() method"""
-        original_cwd = os.getcwd()
-        os.chdir(temp_config_dir)
-        
-        try:
-            config_manager = ConfigManager(str(config_file), str(env_file))
-            servers = config_manager.get_servers()
-            
-            assert 'smp' in servers
-            assert 'xftp' in servers
-            assert servers['smp'] == ['smp://test-server1.com', 'smp://test-server2.com']
-            assert servers['xftp'] == ['xftp://test-files1.com', 'xftp://test-files2.com']
-        finally:
-            os.chdir(original_cwd)
+        servers = sample_config_manager.get_servers()
+        
+        assert 'smp' in servers
+        assert 'xftp' in servers
+        assert servers['smp'] == ['smp://test-server1.com', 'smp://test-server2.com']
+        assert servers['xftp'] == ['xftp://test-files1.com', 'xftp://test-files2.com']
     
-    def test_get_bot_config(self, temp_config_dir, config_file, env_file, mock_env_vars):
+    def test_get_bot_config(self, sample_config_manager):
         """Test get_bot_config() method"""
-        original_cwd = os.getcwd()
-        os.chdir(temp_config_dir)
-        
-        try:
-            config_manager = ConfigManager(str(config_file), str(env_file))
-            bot_config = config_manager.get_bot_config()
-            
-            assert bot_config['name'] == 'Test Bot'
-            assert bot_config['websocket_url'] == 'ws://test:3030'
-            assert bot_config['auto_accept_contacts'] == 'false'  # String after substitution
-        finally:
-            os.chdir(original_cwd)
+        bot_config = sample_config_manager.get_bot_config()
+        
+        assert bot_config['name'] == 'Test Bot'
+        assert bot_config['websocket_url'] == 'ws://test:3030'
+        assert bot_config['auto_accept_contacts'] == 'false'  # String after substitution
     
-    def test_get_logging_config(self, temp_config_dir, config_file, env_file, mock_env_vars):
+    def test_get_logging_config(self, sample_config_manager):
         """Test get_logging_config() method"""
-        original_cwd = os.getcwd()
-        os.chdir(temp_config_dir)
-        
-        try:
-            config_manager = ConfigManager(str(config_file), str(env_file))
-            logging_config = config_manager.get_logging_config()
-            
-            assert logging_config['daily_rotation'] is True
-            assert logging_config['message_log_separate'] is True
-            assert logging_config['retention_days'] == '7'  # String after substitution
-            assert logging_config['log_level'] == 'DEBUG'
-        finally:
-            os.chdir(original_cwd)
+        logging_config = sample_config_manager.get_logging_config()
+        
+        assert logging_config['daily_rotation'] is True
+        assert logging_config['message_log_separate'] is True
+        assert logging_config['retention_days'] == '7'  # String after substitution
+        assert logging_config['log_level'] == 'DEBUG'
     
-    def test_get_media_config(self, temp_config_dir, config_file, env_file, mock_env_vars):
+    def test_get_media_config(self, sample_config_manager):
         """Test get_media_config() method"""
-        original_cwd = os.getcwd()
-        os.chdir(temp_config_dir)
+        media_config = sample_config_manager.get_media_config()
         
-        try:
-            config_manager = ConfigManager(str(config_file), str(env_file))
-            media_config = config_manager.get_media_config()
-            
-            assert media_config['download_enabled'] == 'true'  # String after substitution
-            assert media_config['max_file_size'] == '50MB'
-            assert media_config['storage_path'] == './test_media'
-            assert 'image' in media_config['allowed_types']
-        finally:
-            os.chdir(original_cwd)
+        assert media_config['download_enabled'] == 'true'  # String after substitution
+        assert media_config['max_file_size'] == '50MB'
+        assert media_config['storage_path'] == './test_media'
+        assert 'image' in media_config['allowed_types']
 
 
 class TestFileSizeParsing:
@@ -342,38 +427,66 @@ class TestFileSizeParsing:
         assert parse_file_size("0") == 0
         assert parse_file_size("0B") == 0
         assert parse_file_size("  100MB  ") == 100 * 1024 * 1024  # Whitespace handling
+    
+    def test_parse_file_size_invalid(self):
+        """Test malformed size strings raise ValueError"""
+        for size_str in ["", "MB", "abc", "10XB"]:
+            with pytest.raises(ValueError):
+                parse_file_size(size_str)
 
 
 class TestConfigurationReload:
     """Test configuration reloading functionality"""
     
-    def test_config_reload(self, temp_config_dir, sample_config_dict, mock_env_vars):
+    def test_config_reload(self, temp_config_dir, sample_config_dict, sample_config_yaml, mock_env_vars):
         """Test configuration reloading"""
         config_path = temp_config_dir / "reload_test.yml"
         
         # Create initial configuration
-        with open(config_path, 'w') as f:
-            yaml.dump(sample_config_dict, f)
-        
-        original_cwd = os.getcwd()
-        os.chdir(temp_config_dir)
-        
-        try:
-            config_manager = ConfigManager(str(config_path), "nonexistent.env")
-            original_name = config_manager.get('bot.name')
-            
-            # Modify the configuration file
-            modified_config = sample_config_dict.copy()
-            modified_config['bot']['name'] = 'Modified Bot Name'
-            
-            with open(config_path, 'w') as f:
-                yaml.dump(modified_config, f)
-            
-            # Reload configuration
+        config_path.write_text(sample_config_yaml)
+        
+        config_manager = ConfigManager(str(config_path), "nonexistent.env", base_dir=str(temp_config_dir))
+        original_name = config_manager.get('bot.name')
+        
+        # Modify the configuration file
+        modified_config = {
+            **sample_config_dict,
+            'bot': {**sample_config_dict['bot'], 'name': 'Modified Bot Name'}
+        }
+        
+        _dump(modified_config, config_path)
+        
+        # Reload configuration
+        config_manager.reload()
+        
+        # Check that configuration was reloaded
+        assert config_manager.get('bot.name') == 'Modified Bot Name'
+        assert config_manager.get('bot.name') != original_name
+    
+    def test_unchanged_file_reload_reapplies_env(self, temp_config_dir, sample_config_yaml, mock_env_vars):
+        """Test reloading an untouched file skips the parse but still picks up env changes"""
+        config_path = temp_config_dir / "reload_env_test.yml"
+        config_path.write_text(sample_config_yaml)
+        
+        config_manager = ConfigManager(str(config_path), "nonexistent.env")
+        assert config_manager.get('bot.name') == 'Test Bot'
+        
+        with patch.dict(os.environ, {'BOT_NAME': 'Renamed Via Env'}):
             config_manager.reload()
-            
-            # Check that configuration was reloaded
-            assert config_manager.get('bot.name') == 'Modified Bot Name'
-            assert config_manager.get('bot.name') != original_name
-        finally:
-            os.chdir(original_cwd)
\ No newline at end of file
+            assert config_manager.get('bot.name') == 'Renamed Via Env'
+    
+    def test_same_size_edit_with_unchanged_mtime_is_reloaded(self, temp_config_dir, sample_config_yaml, mock_env_vars):
+        """Test an edit that keeps the file size and mtime is still picked up by reload()"""
+        config_path = temp_config_dir / "reload_same_size_test.yml"
+        config_path.write_text(sample_config_yaml)
+        
+        config_manager = ConfigManager(str(config_path), "nonexistent.env")
+        assert config_manager.get('bot.name') == 'Test Bot'
+        
+        # Same length, but the name no longer reads BOT_NAME so it falls back to the default
+        stat = config_path.stat()
+        config_path.write_text(sample_config_yaml.replace('${BOT_NAME:-', '${BOT_NAMX:-'))
+        os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        
+        config_manager.reload()
+        assert config_manager.get('bot.name') == 'SimpleX Bot'
\ No newline at end of file
@@ -2,40 +2,61 @@
 Tests for FileDownloadManager component
 """
 
+import base64
 import pytest
 import logging
-import tempfile
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from file_download_manager import FileDownloadManager
 from xftp_client import XFTPClient
 
+# Shared XFTP client mock - spec introspection runs once per module, and no test here calls the client
+_XFTP_STUB = MagicMock(spec=XFTPClient)
+
+
+def _media_config(root: Path) -> dict:
+    """Media configuration storing under root"""
+    return {
+        'download_enabled': True,
+        'storage_path': str(root / 'media'),
+        'max_file_size': '100MB',
+        'allowed_types': ['image', 'video', 'document', 'audio']
+    }
+
+
+@pytest.fixture
+def isolated_file_manager(tmp_path):
+    """Fresh manager in its own directory for tests that write media files"""
+    return FileDownloadManager(
+        media_config=_media_config(tmp_path),
+        xftp_client=_XFTP_STUB,
+        logger=logging.getLogger('test')
+    )
+
 
 class TestFileDownloadManager:
     """Test FileDownloadManager functionality"""
     
-    def setup_method(self):
-        """Setup test dependencies"""
-        self.logger = logging.getLogger('test')
-        self.temp_dir = Path(tempfile.mkdtemp())
+    @pytest.fixture(autouse=True, scope="class")
+    def shared_file_manager(self, request, tmp_path_factory):
+        """Build the manager once per class - tests that write files use isolated_file_manager"""
+        cls = request.cls
+        cls.logger = logging.getLogger('test')
+        cls.temp_dir = tmp_path_factory.mktemp("file_manager")
         
         # Mock XFTP client
-        self.xftp_client = MagicMock(spec=XFTPClient)
+        _XFTP_STUB.reset_mock()
+        cls.xftp_client = _XFTP_STUB
         
         # Media configuration
-        self.media_config = {
-            'download_enabled': True,
-            'storage_path': str(self.temp_dir / 'media'),
-            'max_file_size': '100MB',
-            'allowed_types': ['image', 'video', 'document', 'audio']
-        }
+        cls.media_config = _media_config(cls.temp_dir)
         
         # Create file download manager
-        self.file_manager = FileDownloadManager(
-            media_config=self.media_config,
-            xftp_client=self.xftp_client,
-            logger=self.logger
+        cls.file_manager = FileDownloadManager(
+            media_config=cls.media_config,
+            xftp_client=cls.xftp_client,
+            logger=cls.logger
         )
     
     def test_file_manager_initialization(self):
@@ -44,6 +65,8 @@ class TestFileDownloadManager:
         assert self.file_manager.xftp_client == self.xftp_client
         assert self.file_manager.logger == self.logger
         assert self.file_manager.media_enabled == True
+        assert self.file_manager.max_file_size == 100 * 1024 * 1024
+        assert self.file_manager.allowed_types == ['image', 'video', 'document', 'audio']
         assert self.file_manager.media_path.exists()
         
         # Check media subdirectories are created
@@ -58,6 +81,9 @@ class TestFileDownloadManager:
         assert self.file_manager._get_file_type('audio.mp3') == 'audio'
         assert self.file_manager._get_file_type('document.pdf') == 'document'
         assert self.file_manager._get_file_type('unknown.xyz') == 'document'
+        assert self.file_manager._get_file_type('.jpg') == 'document'  # Dotfile, no extension
+        assert self.file_manager._get_file_type('photos/holiday.jpeg') == 'image'
+        assert self.file_manager._get_file_type('..jpg') == 'image'
     
     def test_sanitize_filename(self):
         """Test filename sanitization"""
@@ -117,6 +143,26 @@ class TestFileDownloadManager:
         with pytest.raises(Exception):
             self.file_manager.validate_file_for_download('test.jpg', 1024, '')
     
+    def test_validation_follows_media_config_changes(self, isolated_file_manager):
+        """Test size and type limits are read from the media config as it is now"""
+        isolated_file_manager.media_config['max_file_size'] = '1KB'
+        isolated_file_manager.media_config['allowed_types'] = ['document']
+        
+        assert isolated_file_manager.validate_file_for_download('small.pdf', 512, 'document') == True
+        assert isolated_file_manager.validate_file_for_download('big.pdf', 2048, 'document') == False
+        assert isolated_file_manager.validate_file_for_download('photo.jpg', 512, 'image') == False
+    
+    def test_max_file_size_parsed_once_per_value(self, isolated_file_manager):
+        """Test the size limit is only re-parsed when the configured value changes"""
+        with patch('file_download_manager.parse_file_size', return_value=1024) as mock_parse:
+            for _ in range(3):
+                isolated_file_manager.validate_file_for_download('a.pdf', 512, 'document')
+            assert mock_parse.call_count == 1
+            
+            isolated_file_manager.media_config['max_file_size'] = '2KB'
+            isolated_file_manager.validate_file_for_download('a.pdf', 512, 'document')
+            assert mock_parse.call_count == 2
+    
     def test_extract_file_info_from_content(self):
         """Test file information extraction"""
         # Test SimpleX image format
@@ -147,7 +193,10 @@ class TestFileDownloadManager:
         # Test valid data URL
         data_url = 'data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8/5+hHgAHggJ/PchI7wAAAABJRU5ErkJggg=='
         size = self.file_manager._calculate_data_url_size(data_url)
-        assert size > 0
+        assert size == len(base64.b64decode(data_url.split(',', 1)[1]))
+        
+        # Comma but no payload
+        assert self.file_manager._calculate_data_url_size('data:image/png;base64,') == 0
         
         # Test invalid data URL
         assert self.file_manager._calculate_data_url_size('not a data url') == 0
@@ -180,27 +229,28 @@ class TestFileDownloadManager:
         
         # Should truncate base64 data
         assert len(cleaned['msgContent']['image']) < len(content['msgContent']['image'])
-        assert 'base64_truncated' in cleaned['msgContent']['image']
+        assert cleaned['msgContent']['image'] == 'data:image/png;base64,<base64_truncated>'
+        assert content['msgContent']['image'].endswith('A' * 1000)  # Original left intact
         
         # Test with non-image content
         content = {'msgContent': {'text': 'Hello world'}}
         cleaned = self.file_manager.clean_content_for_logging(content)
         assert cleaned == content  # Should be unchanged
     
-    def test_get_media_statistics(self):
+    def test_get_media_statistics(self, isolated_file_manager):
         """Test media statistics calculation"""
         # Create some test files
-        images_dir = self.file_manager.media_path / 'images'
+        images_dir = isolated_file_manager.media_path / 'images'
         test_file1 = images_dir / 'test1.jpg'
         test_file2 = images_dir / 'test2.png'
         
         test_file1.write_text('fake image data 1')
         test_file2.write_text('fake image data 2')
         
-        stats = self.file_manager.get_media_statistics()
+        stats = isolated_file_manager.get_media_statistics()
         
-        assert stats['total_files'] >= 2
-        assert stats['images'] >= 2
+        assert stats['total_files'] == 2
+        assert stats['images'] == 2
         assert stats['total_size_mb'] > 0
         assert 'videos' in stats
         assert 'documents' in stats
@@ -210,11 +260,11 @@ class TestFileDownloadManager:
 class TestFileDownloadManagerDisabled:
     """Test FileDownloadManager with downloads disabled"""
     
-    def test_disabled_file_manager(self):
+    def test_disabled_file_manager(self, tmp_path):
         """Test FileDownloadManager when downloads are disabled"""
         logger = logging.getLogger('test')
-        temp_dir = Path(tempfile.mkdtemp())
-        xftp_client = MagicMock(spec=XFTPClient)
+        temp_dir = tmp_path
+        xftp_client = _XFTP_STUB
         
         media_config = {
             'download_enabled': False,
@@ -15,18 +15,48 @@ import subprocess
 import time
 import re
 from datetime import datetime
+from pathlib import Path
+
+# Hot reload log lines, keyed by group name so one alternation scan reports which ones matched
+HOT_RELOAD_PATTERNS = {
+    "changed": r"🔥 Plugin file changed: example",
+    "reloading": r"🔄 Reloading plugin: example",
+    "reload": r"Plugin.*example.*reload",
+}
+HOT_RELOAD_PATTERN = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in HOT_RELOAD_PATTERNS.items()),
+    re.IGNORECASE
+)
+
+# Seconds a docker compose logs result is reused for the same query
+LOG_CACHE_TTL = 1.0
+
+# Most recent log lines fetched per check - the reload lines are always near the end
+LOG_TAIL_LINES = 200
 
 class HotReloadTester:
     def __init__(self):
         self.plugin_file = "/home/user/Documents/DEV/SIMPLEX_BOT/plugins/external/example/plugin.py"
         self.original_version = '        self.version = "2.0.0"  # Updated for universal support'
         self.test_version = '        self.version = "2.0.1"  # HOT RELOAD TEST VERSION'
+        # (fetched_at, since_seconds, logs) of the last docker compose call
+        self._log_cache = None
         
     def get_recent_logs(self, since_seconds=10):
         """Get recent bot logs"""
+        # Overlapping queries within a second reuse the last output instead of starting docker compose again
+        if self._log_cache:
+            fetched_at, cached_since, cached_logs = self._log_cache
+            if cached_since == since_seconds and time.monotonic() - fetched_at < LOG_CACHE_TTL:
+                return cached_logs
         try:
-            cmd = f"docker compose -f /home/user/Documents/DEV/SIMPLEX_BOT/docker-compose.yml logs simplex-bot --since={since_seconds}s"
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+            # --tail caps the lines docker streams back; --since stays so the revert check
+            # cannot match the reload logged by the first modification
+            cmd = ["docker", "compose", "-f", "/home/user/Documents/DEV/SIMPLEX_BOT/docker-compose.yml",
+                   "logs", "--tail", str(LOG_TAIL_LINES), "--no-log-prefix", f"--since={since_seconds}s",
+                   "simplex-bot"]
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+            self._log_cache = (time.monotonic(), since_seconds, result.stdout)
             return result.stdout
         except Exception as e:
             print(f"Error getting logs: {e}")
@@ -34,36 +64,38 @@ class HotReloadTester:
     
     def check_for_hot_reload_logs(self, logs):
         """Check if logs contain hot reload activity"""
-        patterns = [
-            r"🔥 Plugin file changed: example",
-            r"🔄 Reloading plugin: example",
-            r"Plugin.*example.*reload"
-        ]
-        
         found_patterns = []
-        for pattern in patterns:
-            if re.search(pattern, logs, re.IGNORECASE):
+        for match in HOT_RELOAD_PATTERN.finditer(logs):
+            pattern = HOT_RELOAD_PATTERNS[match.lastgroup]
+            if pattern not in found_patterns:
                 found_patterns.append(pattern)
+                if len(found_patterns) == len(HOT_RELOAD_PATTERNS):
+                    break
         
-        return found_patterns
+        # Report in declaration order, as the per-pattern searches did
+        return [pattern for pattern in HOT_RELOAD_PATTERNS.values() if pattern in found_patterns]
     
     def modify_plugin_file(self, new_content_line):
         """Modify the plugin file with new version"""
         try:
-            with open(self.plugin_file, 'r') as f:
-                content = f.read()
+            plugin_path = Path(self.plugin_file)
+            content = plugin_path.read_text()
+            
+            # Already at the requested version - nothing to write
+            if new_content_line in content:
+                print(f"✅ Plugin file already has: {new_content_line.strip()}")
+                return True
             
             # Replace the version line
             if self.original_version in content:
-                new_content = content.replace(self.original_version, new_content_line)
+                new_content = content.replace(self.original_version, new_content_line, 1)
             elif self.test_version in content:
-                new_content = content.replace(self.test_version, new_content_line)
+                new_content = content.replace(self.test_version, new_content_line, 1)
             else:
                 print("ERROR: Could not find version line to replace!")
                 return False
             
-            with open(self.plugin_file, 'w') as f:
-                f.write(new_content)
+            plugin_path.write_text(new_content)
             
             print(f"✅ Modified plugin file: {new_content_line.strip()}")
             return True
@@ -13,37 +13,66 @@ from bot import CommandRegistry
 from admin_manager import AdminManager
 
 
+# Default commands run end-to-end through the handler, one test case each
+INTEGRATION_COMMANDS = ['!help', '!status', '!ping', '!stats']
+
+
+@pytest.fixture(scope="module")
+def command_registry(admin_manager, silent_logger):
+    """CommandRegistry shared by the module's message_handler"""
+    return CommandRegistry(silent_logger, admin_manager)
+
+
+@pytest.fixture(scope="module")
+def file_download_manager():
+    """FileDownloadManager mock shared by the module's message_handler"""
+    return MagicMock(spec=FileDownloadManager)
+
+
+@pytest.fixture(scope="module")
+def message_handler(command_registry, file_download_manager, silent_logger):
+    """MessageHandler built once per module - use send_callback for a fresh callback per test"""
+    handler = MessageHandler(
+        command_registry=command_registry,
+        file_download_manager=file_download_manager,
+        send_message_callback=AsyncMock(),
+        logger=silent_logger,
+        message_logger=logging.getLogger('test_messages')
+    )
+    
+    # Mock bot instance for plugin manager integration
+    mock_bot = MagicMock()
+    mock_bot.plugin_manager = MagicMock()
+    handler._bot_instance = mock_bot
+    return handler
+
+
+@pytest.fixture(scope="module")
+def permissive_message_handler(silent_logger):
+    """MessageHandler whose admin manager allows every command, built once per module"""
+    admin_manager = MagicMock(spec=AdminManager)
+    admin_manager.can_run_command.return_value = True  # Allow all commands for testing
+    return MessageHandler(
+        command_registry=CommandRegistry(silent_logger, admin_manager),
+        file_download_manager=MagicMock(spec=FileDownloadManager),
+        send_message_callback=AsyncMock(),
+        logger=silent_logger,
+        message_logger=logging.getLogger('test_messages')
+    )
+
+
+@pytest.fixture
+def send_callback(message_handler):
+    """Fresh send_message_callback installed on the shared handler for each test"""
+    # The background processor sends through a wrapper that looks the callback up on every call
+    message_handler.send_message_callback = AsyncMock()
+    return message_handler.send_message_callback
+
+
 class TestMessageHandler:
     """Test MessageHandler functionality"""
     
-    def setup_method(self):
-        """Setup test dependencies"""
-        self.logger = logging.getLogger('test')
-        self.message_logger = logging.getLogger('test_messages')
-        
-        # Mock dependencies
-        self.admin_manager = AdminManager(logger=self.logger)
-        self.command_registry = CommandRegistry(self.logger, self.admin_manager)
-        self.file_download_manager = MagicMock(spec=FileDownloadManager)
-        self.send_message_callback = AsyncMock()
-        
-        # Create message handler - note: constructor may have changed for universal architecture
-        self.message_handler = MessageHandler(
-            command_registry=self.command_registry,
-            file_download_manager=self.file_download_manager,
-            send_message_callback=self.send_message_callback,
-            logger=self.logger,
-            message_logger=self.message_logger
-        )
-        
-        # Mock bot instance for plugin manager integration
-        self.mock_bot = MagicMock()
-        self.mock_plugin_manager = MagicMock()
-        self.mock_bot.plugin_manager = self.mock_plugin_manager
-        self.message_handler._bot_instance = self.mock_bot
-    
-    @pytest.mark.asyncio
-    async def test_process_text_message(self):
+    async def test_process_text_message(self, message_handler, send_callback):
         """Test processing text messages"""
         message_data = {
             'chatItem': {
@@ -60,13 +89,12 @@ class TestMessageHandler:
             }
         }
         
-        await self.message_handler.process_message(message_data)
+        await message_handler.process_message(message_data)
         
         # Should not call send_message for regular text
-        self.send_message_callback.assert_not_called()
+        send_callback.assert_not_called()
     
-    @pytest.mark.asyncio
-    async def test_process_command_message(self):
+    async def test_process_command_message(self, message_handler, send_callback):
         """Test processing command messages"""
         message_data = {
             'chatItem': {
@@ -83,16 +111,15 @@ class TestMessageHandler:
             }
         }
         
-        await self.message_handler.process_message(message_data)
+        await message_handler.process_message(message_data)
         
         # Should call send_message for help command
-        self.send_message_callback.assert_called_once()
-        call_args = self.send_message_callback.call_args
+        send_callback.assert_called_once()
+        call_args = send_callback.call_args
         assert call_args[0][0] == 'TestUser'  # Contact name
         assert 'commands' in call_args[0][1].lower()  # Response contains 'commands'
     
-    @pytest.mark.asyncio
-    async def test_process_file_message(self):
+    async def test_process_file_message(self, message_handler, send_callback):
         """Test processing file messages"""
         message_data = {
             'chatItem': {
@@ -113,13 +140,12 @@ class TestMessageHandler:
             }
         }
         
-        await self.message_handler.process_message(message_data)
+        await message_handler.process_message(message_data)
         
         # Should not call send_message for file messages
-        self.send_message_callback.assert_not_called()
+        send_callback.assert_not_called()
     
-    @pytest.mark.asyncio
-    async def test_process_malformed_message(self):
+    async def test_process_malformed_message(self, message_handler, send_callback):
         """Test processing malformed messages"""
         malformed_messages = [
             {},  # Empty
@@ -130,74 +156,52 @@ class TestMessageHandler:
         
         for message_data in malformed_messages:
             # Should not raise exceptions
-            await self.message_handler.process_message(message_data)
+            await message_handler.process_message(message_data)
             
         # Should not call send_message for malformed messages
-        self.send_message_callback.assert_not_called()
+        send_callback.assert_not_called()
     
-    def test_message_handler_initialization(self):
+    def test_message_handler_initialization(self, message_handler, command_registry,
+                                            file_download_manager, send_callback, silent_logger):
         """Test MessageHandler initialization"""
-        assert self.message_handler.command_registry == self.command_registry
-        assert self.message_handler.file_download_manager == self.file_download_manager
-        assert self.message_handler.send_message_callback == self.send_message_callback
-        assert self.message_handler.logger == self.logger
-        assert self.message_handler.message_logger == self.message_logger
-        assert self.message_handler.MESSAGE_PREVIEW_LENGTH == 100
+        assert message_handler.command_registry is command_registry
+        assert message_handler.file_download_manager is file_download_manager
+        assert message_handler.send_message_callback is send_callback
+        assert message_handler.logger is silent_logger
+        assert message_handler.message_logger is logging.getLogger('test_messages')
+        assert message_handler.MESSAGE_PREVIEW_LENGTH == 100
 
 
 class TestMessageHandlerIntegration:
     """Test MessageHandler integration with other components"""
     
-    @pytest.mark.asyncio
-    async def test_command_execution_integration(self):
+    @pytest.mark.parametrize("command", INTEGRATION_COMMANDS)
+    async def test_command_execution_integration(self, permissive_message_handler, command):
         """Test command execution through MessageHandler"""
-        logger = logging.getLogger('test')
-        message_logger = logging.getLogger('test_messages')
-        
-        # Create real command registry with admin manager
-        admin_manager = MagicMock(spec=AdminManager)
-        admin_manager.can_run_command.return_value = True  # Allow all commands for testing
-        command_registry = CommandRegistry(logger, admin_manager)
-        
-        # Mock other dependencies
-        file_download_manager = MagicMock(spec=FileDownloadManager)
-        send_message_callback = AsyncMock()
-        
-        # Create message handler
-        message_handler = MessageHandler(
-            command_registry=command_registry,
-            file_download_manager=file_download_manager,
-            send_message_callback=send_message_callback,
-            logger=logger,
-            message_logger=message_logger
-        )
+        message_handler = permissive_message_handler
+        send_message_callback = message_handler.send_message_callback
+        send_message_callback.reset_mock()
         
-        # Test each default command
-        commands_to_test = ['!help', '!status', '!ping', '!stats']
-        
-        for command in commands_to_test:
-            send_message_callback.reset_mock()
-            
-            message_data = {
-                'chatItem': {
-                    'chatDir': {'contact': 'test_contact'},
-                    'meta': {'createdAt': '2025-01-01T00:00:00.000Z'},
-                    'content': {
-                        'msgContent': {'type': 'text', 'text': command}
-                    }
-                },
-                'chatInfo': {
-                    'contact': {
-                        'localDisplayName': 'TestUser'
-                    }
+        message_data = {
+            'chatItem': {
+                'chatDir': {'contact': 'test_contact'},
+                'meta': {'createdAt': '2025-01-01T00:00:00.000Z'},
+                'content': {
+                    'msgContent': {'type': 'text', 'text': command}
+                }
+            },
+            'chatInfo': {
+                'contact': {
+                    'localDisplayName': 'TestUser'
                 }
             }
-            
-            await message_handler.process_message(message_data)
-            
-            # Should call send_message for each command
-            send_message_callback.assert_called_once()
-            call_args = send_message_callback.call_args
-            assert call_args[0][0] == 'TestUser'  # Contact name
-            assert isinstance(call_args[0][1], str)  # Response is string
-            assert len(call_args[0][1]) > 0  # Response is not empty
\ No newline at end of file
+        }
+        
+        await message_handler.process_message(message_data)
+        
+        # Should call send_message for each command
+        send_message_callback.assert_called_once()
+        call_args = send_message_callback.call_args
+        assert call_args[0][0] == 'TestUser'  # Contact name
+        assert isinstance(call_args[0][1], str)  # Response is string
+        assert len(call_args[0][1]) > 0  # Response is not empty
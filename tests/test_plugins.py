@@ -3,11 +3,12 @@
 Test script for the universal plugin system
 """
 import asyncio
+import logging
 import sys
-import pytest
 from bot import SimplexChatBot
 
-@pytest.mark.asyncio
+log = logging.getLogger(__name__)
+
 async def test_plugin_integration():
     print("🚀 Testing Universal Plugin System Integration")
     print("=" * 50)
@@ -39,25 +40,33 @@ async def test_plugin_integration():
         test_commands = ['!help', '!ping', '!status', '!plugins', '!echo hello', '!youtube']
         contact_name = 'TestUser'
         
-        for cmd in test_commands:
-            print(f"\nTesting command: {cmd}")
-            
-            # Check if recognized
+        async def run_command(cmd):
+            """Detect and execute one command, returning its outcome for reporting"""
             is_cmd = bot.command_registry.is_command(cmd)
+            if not is_cmd:
+                return cmd, is_cmd, None, None
+            try:
+                result = await bot.command_registry.execute_command(cmd, contact_name, bot.plugin_manager)
+                return cmd, is_cmd, result, None
+            except Exception as e:
+                return cmd, is_cmd, None, e
+        
+        # Commands are independent, so dispatch them concurrently and report in order
+        outcomes = await asyncio.gather(*(run_command(cmd) for cmd in test_commands))
+        
+        for cmd, is_cmd, result, error in outcomes:
+            print(f"\nTesting command: {cmd}")
             print(f"  - is_command: {is_cmd}")
             
-            if is_cmd:
-                try:
-                    result = await bot.command_registry.execute_command(cmd, contact_name, bot.plugin_manager)
-                    if result:
-                        print(f"  ✅ Success (length: {len(result)})")
-                        print(f"  📝 Preview: {result[:150]}...")
-                    else:
-                        print(f"  ❌ No result returned")
-                except Exception as e:
-                    print(f"  ❌ Error: {e}")
-            else:
+            if not is_cmd:
                 print(f"  ❌ Not recognized as command")
+            elif error is not None:
+                print(f"  ❌ Error: {error}")
+            elif result:
+                print(f"  ✅ Success (length: {len(result)})")
+                print(f"  📝 Preview: {result[:150]}...")
+            else:
+                print(f"  ❌ No result returned")
         
         # Test direct plugin manager commands
         print("\n4. Testing direct plugin manager...")
@@ -92,9 +101,7 @@ async def test_plugin_integration():
         print("🚀 Ready for SimpleX bot deployment!")
         
     except Exception as e:
-        print(f"❌ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("❌ Test failed: %s", e)
 
 if __name__ == "__main__":
     asyncio.run(test_plugin_integration())
\ No newline at end of file
@@ -8,6 +8,7 @@ import yaml
 from unittest.mock import patch
 
 from config_manager import ConfigManager
+from yaml_io import DUMPER as _DUMPER
 
 
 class TestSpecificConfigurationIssues:
@@ -30,7 +31,7 @@ class TestSpecificConfigurationIssues:
         
         config_path = temp_config_dir / "auto_accept_test.yml"
         with open(config_path, 'w') as f:
-            yaml.dump(config_data, f)
+            yaml.dump(config_data, f, Dumper=_DUMPER)
         
         # Test with different boolean-like environment variable values
         test_cases = [
@@ -71,7 +72,7 @@ class TestSpecificConfigurationIssues:
         
         config_path = temp_config_dir / "auto_accept_default_test.yml"
         with open(config_path, 'w') as f:
-            yaml.dump(config_data, f)
+            yaml.dump(config_data, f, Dumper=_DUMPER)
         
         # Clear AUTO_ACCEPT_CONTACTS from environment
         env_backup = os.environ.get('AUTO_ACCEPT_CONTACTS')
@@ -118,7 +119,7 @@ class TestSpecificConfigurationIssues:
             
             config_path = temp_config_dir / f"bot_auto_accept_{env_value}.yml"
             with open(config_path, 'w') as f:
-                yaml.dump(config_data, f)
+                yaml.dump(config_data, f, Dumper=_DUMPER)
             
             original_cwd = os.getcwd()
             os.chdir(temp_config_dir)
@@ -164,7 +165,7 @@ class TestSpecificConfigurationIssues:
         
         config_path = temp_config_dir / "malformed_syntax_test.yml"
         with open(config_path, 'w') as f:
-            yaml.dump(config_data, f)
+            yaml.dump(config_data, f, Dumper=_DUMPER)
         
         # Clear environment variable
         if 'AUTO_ACCEPT_CONTACTS' in os.environ:
@@ -219,7 +220,7 @@ class TestSpecificConfigurationIssues:
         
         config_path = temp_config_dir / "real_world_test.yml"
         with open(config_path, 'w') as f:
-            yaml.dump(config_data, f)
+            yaml.dump(config_data, f, Dumper=_DUMPER)
         
         # Test with minimal required environment variables
         with patch.dict(os.environ, {
@@ -261,7 +262,7 @@ class TestSpecificConfigurationIssues:
         
         config_path = temp_config_dir / "optional_servers_test.yml"
         with open(config_path, 'w') as f:
-            yaml.dump(config_data, f)
+            yaml.dump(config_data, f, Dumper=_DUMPER)
         
         # Test with only primary servers set
         with patch.dict(os.environ, {
@@ -2,7 +2,6 @@
 Tests for WebSocketManager component
 """
 
-import pytest
 import asyncio
 import json
 import logging
@@ -55,7 +54,6 @@ class TestWebSocketManager:
         assert corr_id2.startswith('bot_req_')
         assert self.ws_manager.correlation_counter == 2
     
-    @pytest.mark.asyncio
     async def test_connect_success(self):
         """Test successful WebSocket connection"""
         with patch('websockets.connect', new_callable=AsyncMock) as mock_connect:
@@ -68,7 +66,6 @@ class TestWebSocketManager:
             assert self.ws_manager.websocket == mock_websocket
             mock_connect.assert_called_once_with(self.websocket_url)
     
-    @pytest.mark.asyncio
     async def test_connect_failure(self):
         """Test WebSocket connection failure"""
         with patch('websockets.connect', new_callable=AsyncMock) as mock_connect:
@@ -80,7 +77,6 @@ class TestWebSocketManager:
             assert self.ws_manager.websocket is None
             assert mock_connect.call_count == 2
     
-    @pytest.mark.asyncio
     async def test_disconnect(self):
         """Test WebSocket disconnection"""
         mock_websocket = AsyncMock()
@@ -90,7 +86,6 @@ class TestWebSocketManager:
         
         mock_websocket.close.assert_called_once()
     
-    @pytest.mark.asyncio
     async def test_send_command_basic(self):
         """Test basic command sending"""
         mock_websocket = AsyncMock()
@@ -105,7 +100,6 @@ class TestWebSocketManager:
         assert sent_data['cmd'] == "test command"
         assert 'corrId' in sent_data
     
-    @pytest.mark.asyncio
     async def test_send_command_no_connection(self):
         """Test command sending without connection"""
         self.ws_manager.websocket = None
@@ -114,7 +108,6 @@ class TestWebSocketManager:
         
         assert result is None
     
-    @pytest.mark.asyncio
     async def test_send_message(self):
         """Test message sending"""
         mock_websocket = AsyncMock()
@@ -128,7 +121,6 @@ class TestWebSocketManager:
         
         assert sent_data['cmd'] == "@TestUser Hello world"
     
-    @pytest.mark.asyncio
     async def test_send_message_truncation(self):
         """Test message truncation for long messages"""
         mock_websocket = AsyncMock()
@@ -144,7 +136,6 @@ class TestWebSocketManager:
         assert len(sent_data['cmd']) < len(f"@TestUser {long_message}")
         assert sent_data['cmd'].endswith("...")
     
-    @pytest.mark.asyncio
     async def test_accept_contact_request(self):
         """Test accepting contact requests"""
         mock_websocket = AsyncMock()
@@ -158,7 +149,6 @@ class TestWebSocketManager:
         
         assert sent_data['cmd'] == "/ac 123"
     
-    @pytest.mark.asyncio
     async def test_connect_to_address(self):
         """Test connecting to SimpleX address"""
         mock_websocket = AsyncMock()
@@ -276,7 +266,6 @@ class TestWebSocketManager:
         data = json.loads(regular_message)
         self.ws_manager._log_websocket_message_safely(regular_message, data)
     
-    @pytest.mark.asyncio
     async def test_handle_response_success(self):
         """Test handling successful responses"""
         # Mock handler
@@ -298,7 +287,6 @@ class TestWebSocketManager:
         # Verify handler was called
         test_handler.assert_called_once_with({'type': 'testType', 'data': 'test_data'})
     
-    @pytest.mark.asyncio
     async def test_handle_response_error(self):
         """Test handling error responses"""
         response_data = {
@@ -313,7 +301,6 @@ class TestWebSocketManager:
         # Should not raise exception
         await self.ws_manager._handle_response(response_data)
     
-    @pytest.mark.asyncio
     async def test_handle_response_correlation(self):
         """Test handling responses with correlation IDs"""
         corr_id = 'test_corr_id'
@@ -339,7 +326,6 @@ class TestWebSocketManager:
 class TestWebSocketManagerErrors:
     """Test WebSocketManager error handling"""
     
-    @pytest.mark.asyncio
     async def test_send_command_websocket_error(self):
         """Test command sending with WebSocket errors"""
         logger = logging.getLogger('test')
@@ -353,7 +339,6 @@ class TestWebSocketManagerErrors:
         
         assert result is None
     
-    @pytest.mark.asyncio
     async def test_handle_response_exception(self):
         """Test response handling with exceptions"""
         logger = logging.getLogger('test')
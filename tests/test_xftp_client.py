@@ -148,7 +148,6 @@ class TestXFTPCLIInterface:
         assert result['status'] == 'error'
         assert 'Failed to connect' in result['error']
     
-    @pytest.mark.asyncio
     async def test_execute_recv_timeout(self, temp_dir):
         """Test CLI execution with timeout"""
         cli = XFTPCLIInterface('/nonexistent/xftp', timeout=1)
@@ -252,7 +251,6 @@ class TestXFTPClient:
         xftp_client.cli_path = '/nonexistent/xftp'
         assert xftp_client.is_available() is False
     
-    @pytest.mark.asyncio
     async def test_cleanup_temp_files(self, xftp_client, temp_dir):
         """Test temporary file cleanup"""
         # Create session directory with files
@@ -271,7 +269,6 @@ class TestXFTPClient:
         
         assert not session_dir.exists()
     
-    @pytest.mark.asyncio
     async def test_download_file_invalid_size(self, xftp_client):
         """Test download with invalid file size"""
         result = await xftp_client.download_file(
@@ -284,7 +281,6 @@ class TestXFTPClient:
         
         assert result is False
     
-    @pytest.mark.asyncio
     async def test_download_file_missing_xftp_cli(self, xftp_client):
         """Test download when XFTP CLI is not available"""
         xftp_client.cli_path = '/nonexistent/xftp'
@@ -303,7 +299,6 @@ class TestXFTPClient:
 class TestXFTPIntegration:
     """Integration tests for XFTP functionality"""
     
-    @pytest.mark.asyncio
     async def test_download_workflow_mock_success(self, xftp_client, temp_dir):
         """Test complete download workflow with mocked CLI success"""
         output_path = os.path.join(temp_dir, 'downloaded_file.txt')
@@ -338,7 +333,6 @@ class TestXFTPIntegration:
                     
                     assert result is True
     
-    @pytest.mark.asyncio
     async def test_download_workflow_cli_failure(self, xftp_client, temp_dir):
         """Test download workflow with CLI failure"""
         output_path = os.path.join(temp_dir, 'failed_file.txt')
@@ -363,7 +357,6 @@ class TestXFTPIntegration:
             
             assert result is False
     
-    @pytest.mark.asyncio
     async def test_download_workflow_integrity_failure(self, xftp_client, temp_dir):
         """Test download workflow with integrity verification failure"""
         output_path = os.path.join(temp_dir, 'corrupt_file.txt')
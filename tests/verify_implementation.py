@@ -5,127 +5,131 @@ and checking that our parsing works
 """
 
 import asyncio
-import json
-import websockets
+import logging
 import time
 
-async def verify_bot_commands():
+from ws_json import CONNECT_OPTIONS, dumps as _dumps, loads as _loads, run
+
+log = logging.getLogger(__name__)
+
+async def verify_bot_commands(websocket):
     """Verify that our command implementation works correctly"""
-    uri = "ws://localhost:3030"
+    # All three commands in flight at once; replies are matched by corrId, not order
+    t = int(time.time())
+    corr_ids = {
+        "contacts": f"verify_contacts_{t}",
+        "groups": f"verify_groups_{t}",
+        "help": f"verify_help_{t}",
+    }
+    # Text frames, rendered up front - the CLI ignores binary frames
+    frames = [_dumps({"corrId": corr_id, "cmd": f"/{name}"}) for name, corr_id in corr_ids.items()]
+    print("\n📤 Sending /contacts, /groups and /help...")
+    for frame in frames:
+        await websocket.send(frame)
     
+    wanted = set(corr_ids.values())
+    responses = {}
     try:
-        print(f"Connecting to {uri}...")
-        async with websockets.connect(uri) as websocket:
-            print("✅ Connected to SimpleX CLI WebSocket")
-            
-            # Test 1: Test /contacts command and our parsing
-            print(f"\n📤 Test 1: Testing /contacts command...")
-            corr_id = f"verify_contacts_{int(time.time())}"
-            message = {"corrId": corr_id, "cmd": "/contacts"}
-            
-            await websocket.send(json.dumps(message))
-            
-            try:
-                response = await asyncio.wait_for(websocket.recv(), timeout=10.0)
-                resp_data = json.loads(response)
-                
-                print("✅ /contacts command successful")
+        # websockets allows a single pending recv, so drain the replies in one loop,
+        # skipping CLI events and anything else that is not one of our corrIds
+        async with asyncio.timeout(10.0):
+            while len(responses) < len(wanted):
+                resp_data = _loads(await websocket.recv())
+                corr_id = resp_data.get('corrId')
+                if corr_id in wanted:
+                    responses[corr_id] = resp_data
+    except TimeoutError:
+        pass
+    
+    # Test 1: Test /contacts command and our parsing
+    print(f"\n📤 Test 1: /contacts command...")
+    resp_data = responses.get(corr_ids["contacts"])
+    if resp_data is None:
+        print("❌ /contacts command timed out")
+    else:
+        print("✅ /contacts command successful")
+        
+        # Test our parsing function
+        if 'resp' in resp_data and 'Right' in resp_data['resp']:
+            actual_resp = resp_data['resp']['Right']
+            if actual_resp.get('type') == 'contactsList':
+                contacts = actual_resp.get('contacts', [])
+                print(f"✅ Found {len(contacts)} contacts")
                 
-                # Test our parsing function
-                if 'resp' in resp_data and 'Right' in resp_data['resp']:
-                    actual_resp = resp_data['resp']['Right']
-                    if actual_resp.get('type') == 'contactsList':
-                        contacts = actual_resp.get('contacts', [])
-                        print(f"✅ Found {len(contacts)} contacts")
-                        
-                        # Show contact info like our bot would
-                        if contacts:
-                            print("📋 Contacts list (as bot would display):")
-                            for i, contact in enumerate(contacts, 1):
-                                name = contact.get('localDisplayName', 'Unknown')
-                                contact_status = contact.get('contactStatus', 'unknown')
-                                conn_status = 'disconnected'
-                                if 'activeConn' in contact and contact['activeConn']:
-                                    conn_status = contact['activeConn'].get('connStatus', 'unknown')
-                                print(f"  {i}. {name} (Contact: {contact_status}, Connection: {conn_status})")
-                        else:
-                            print("  No contacts found.")
-                    else:
-                        print(f"❌ Unexpected response type: {actual_resp.get('type')}")
+                # Show contact info like our bot would
+                if contacts:
+                    print("📋 Contacts list (as bot would display):")
+                    for i, contact in enumerate(contacts, 1):
+                        name = contact.get('localDisplayName', 'Unknown')
+                        contact_status = contact.get('contactStatus', 'unknown')
+                        conn_status = 'disconnected'
+                        if 'activeConn' in contact and contact['activeConn']:
+                            conn_status = contact['activeConn'].get('connStatus', 'unknown')
+                        print(f"  {i}. {name} (Contact: {contact_status}, Connection: {conn_status})")
                 else:
-                    print(f"❌ Unexpected response format")
-                    
-            except asyncio.TimeoutError:
-                print("❌ /contacts command timed out")
-            
-            await asyncio.sleep(1)
-            
-            # Test 2: Test /groups command and our parsing
-            print(f"\n📤 Test 2: Testing /groups command...")
-            corr_id = f"verify_groups_{int(time.time())}"
-            message = {"corrId": corr_id, "cmd": "/groups"}
-            
-            await websocket.send(json.dumps(message))
-            
-            try:
-                response = await asyncio.wait_for(websocket.recv(), timeout=10.0)
-                resp_data = json.loads(response)
-                
-                print("✅ /groups command successful")
+                    print("  No contacts found.")
+            else:
+                print(f"❌ Unexpected response type: {actual_resp.get('type')}")
+        else:
+            print(f"❌ Unexpected response format")
+    
+    # Test 2: Test /groups command and our parsing
+    print(f"\n📤 Test 2: /groups command...")
+    resp_data = responses.get(corr_ids["groups"])
+    if resp_data is None:
+        print("❌ /groups command timed out")
+    else:
+        print("✅ /groups command successful")
+        
+        # Test our parsing function
+        if 'resp' in resp_data and 'Right' in resp_data['resp']:
+            actual_resp = resp_data['resp']['Right']
+            if actual_resp.get('type') == 'groupsList':
+                groups = actual_resp.get('groups', [])
+                print(f"✅ Found {len(groups)} groups")
                 
-                # Test our parsing function
-                if 'resp' in resp_data and 'Right' in resp_data['resp']:
-                    actual_resp = resp_data['resp']['Right']
-                    if actual_resp.get('type') == 'groupsList':
-                        groups = actual_resp.get('groups', [])
-                        print(f"✅ Found {len(groups)} groups")
-                        
-                        # Show group info like our bot would
-                        if groups:
-                            print("📋 Groups list (as bot would display):")
-                            for i, group in enumerate(groups, 1):
-                                name = group.get('displayName', 'Unknown')
-                                # Note: We'll need to see group structure when there are actual groups
-                                print(f"  {i}. {name}")
-                        else:
-                            print("  No groups found.")
-                    else:
-                        print(f"❌ Unexpected response type: {actual_resp.get('type')}")
+                # Show group info like our bot would
+                if groups:
+                    print("📋 Groups list (as bot would display):")
+                    for i, group in enumerate(groups, 1):
+                        name = group.get('displayName', 'Unknown')
+                        # Note: We'll need to see group structure when there are actual groups
+                        print(f"  {i}. {name}")
                 else:
-                    print(f"❌ Unexpected response format")
-                    
-            except asyncio.TimeoutError:
-                print("❌ /groups command timed out")
-            
-            await asyncio.sleep(1)
-            
-            # Test 3: Test /help command  
-            print(f"\n📤 Test 3: Testing /help command...")
-            corr_id = f"verify_help_{int(time.time())}"
-            message = {"corrId": corr_id, "cmd": "/help"}
-            
-            await websocket.send(json.dumps(message))
-            
-            try:
-                response = await asyncio.wait_for(websocket.recv(), timeout=10.0)
-                resp_data = json.loads(response)
-                
-                print("✅ /help command successful")
-                print(f"Response type: {resp_data.get('resp', {}).get('Right', {}).get('type', 'unknown')}")
-                    
-            except asyncio.TimeoutError:
-                print("❌ /help command timed out")
-            
-            print(f"\n🏁 Verification Summary:")
-            print(f"✅ Bot's CLI commands are working correctly")
-            print(f"✅ Our parsing functions should handle the responses")
-            print(f"✅ Contact and group listing implementation is correct")
-            print(f"\n📝 Next: Test the bot commands through actual SimpleX Chat interface")
-                
+                    print("  No groups found.")
+            else:
+                print(f"❌ Unexpected response type: {actual_resp.get('type')}")
+        else:
+            print(f"❌ Unexpected response format")
+    
+    # Test 3: Test /help command  
+    print(f"\n📤 Test 3: /help command...")
+    resp_data = responses.get(corr_ids["help"])
+    if resp_data is None:
+        print("❌ /help command timed out")
+    else:
+        print("✅ /help command successful")
+        print(f"Response type: {resp_data.get('resp', {}).get('Right', {}).get('type', 'unknown')}")
+    
+    print(f"\n🏁 Verification Summary:")
+    print(f"✅ Bot's CLI commands are working correctly")
+    print(f"✅ Our parsing functions should handle the responses")
+    print(f"✅ Contact and group listing implementation is correct")
+    print(f"\n📝 Next: Test the bot commands through actual SimpleX Chat interface")
+
+async def main():
+    """Open one connection and run the verification over it"""
+    import websockets
+    
+    uri = "ws://localhost:3030"
+    
+    try:
+        print(f"Connecting to {uri}...")
+        async with websockets.connect(uri, **CONNECT_OPTIONS) as websocket:
+            print("✅ Connected to SimpleX CLI WebSocket")
+            await verify_bot_commands(websocket)
     except Exception as e:
-        print(f"❌ Error: {type(e).__name__}: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("❌ Error: %s: %s", type(e).__name__, e)
 
 if __name__ == "__main__":
-    asyncio.run(verify_bot_commands())
\ No newline at end of file
+    run(main())
\ No newline at end of file
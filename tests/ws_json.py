@@ -0,0 +1,27 @@
+"""
+JSON encoding, connection settings and event loop runner for SimpleX CLI WebSockets,
+shared by the live test and debug scripts
+"""
+
+import json
+
+# orjson parses and serializes the nested SimpleX payloads faster when available
+try:
+    import orjson
+    loads = orjson.loads
+    
+    def dumps(obj) -> str:
+        """Serialize obj to a str - SimpleX CLI expects text frames, so websockets must get str rather than bytes"""
+        return orjson.dumps(obj).decode()
+except ImportError:
+    loads = json.loads
+    dumps = json.dumps
+
+# Small JSON frames only: skip per-message deflate and receive-queue backpressure
+CONNECT_OPTIONS = {"max_size": None, "compression": None, "max_queue": None}
+
+# uvloop's libuv-based loop when it is installed, the stock loop otherwise
+try:
+    from uvloop import run
+except ImportError:
+    from asyncio import run
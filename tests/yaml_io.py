@@ -0,0 +1,8 @@
+"""
+YAML serialization for the test helpers, shared by conftest and the config test modules
+"""
+
+import yaml
+
+# libyaml's C emitter when PyYAML was built with it, the pure-Python one otherwise
+DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
@@ -203,10 +203,11 @@ class WebSocketManager:
             self.logger.info(f"🔍 WS DEBUG: About to send command on WebSocket {id(self.websocket)}")
             self.logger.info(f"🔍 WS DEBUG: WebSocket state - connected: {self.websocket is not None}")
             
-            # Log the exact message being sent
-            self.logger.info(f"🔍 RAW SEND: {json.dumps(message)}")
+            # Serialized once - the logged frame is the exact text that goes on the wire
+            payload = json.dumps(message)
+            self.logger.info(f"🔍 RAW SEND: {payload}")
             
-            await self.websocket.send(json.dumps(message))
+            await self.websocket.send(payload)
             self.logger.info(f"📤 SENT: Command '{command}' sent successfully (corr_id: {corr_id})")
             self.logger.info(f"🔍 WS DEBUG: Send completed without exceptions")
             
@@ -710,10 +711,14 @@ class WebSocketManager:
                             file_name = "image"
                             image_data = msg_content.get("image", "")
                             if image_data.startswith("data:image/"):
-                                # Calculate approximate size from data URL
-                                if "," in image_data:
-                                    base64_data = image_data.split(",", 1)[1]
-                                    file_size = (len(base64_data.rstrip("=")) * 3) // 4
+                                # Calculate approximate size from data URL - from indices, without
+                                # splitting off and stripping copies of the base64 payload
+                                comma = image_data.find(",")
+                                if comma >= 0:
+                                    end = len(image_data)
+                                    while end > comma + 1 and image_data[end - 1] == "=":
+                                        end -= 1
+                                    file_size = ((end - comma - 1) * 3) // 4
                                 else:
                                     file_size = 0
                             else:
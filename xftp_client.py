@@ -9,6 +9,7 @@ import hashlib
 import json
 import logging
 import os
+import re
 import subprocess
 import tempfile
 import time
@@ -25,6 +26,7 @@ DEFAULT_TIMEOUT_SECONDS = 300
 DEFAULT_MAX_FILE_SIZE = 1024 * 1024 * 1024  # 1GB
 DEFAULT_RETRY_ATTEMPTS = 3
 HASH_CHUNK_SIZE = 4096
+PROGRESS_PATTERN = re.compile(r'(\d+)%')
 
 
 @dataclass
@@ -137,8 +139,7 @@ class XFTPCLIInterface:
             elif '%' in line:
                 # Try to extract progress percentage
                 try:
-                    import re
-                    match = re.search(r'(\d+)%', line)
+                    match = PROGRESS_PATTERN.search(line)
                     if match:
                         result['progress'] = int(match.group(1))
                 except: